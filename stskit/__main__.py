@@ -22,6 +22,7 @@ import trio
 import qtrio
 
 from stskit.stsplugin import PluginClient, TaskDone, DEFAULT_HOST, DEFAULT_PORT
+from stskit.stsobj import Ereignis
 from stskit.zentrale import DatenZentrale
 from stskit.anschlussmatrix import AnschlussmatrixWindow
 from stskit.bildfahrplan import BildFahrplanWindow
@@ -189,7 +190,9 @@ class MainWindow(QtWidgets.QMainWindow):
         layout.addWidget(self.statusfeld)
 
         self.update_interval: int = 30  # seconds
+        self.update_interval_min: int = 10  # seconds
         self.enable_update: bool = True
+        self._update_vorziehen = trio.Event()
 
     def ticker_clicked(self):
         window = TickerWindow(self.zentrale)
@@ -266,8 +269,22 @@ class MainWindow(QtWidgets.QMainWindow):
             self.closed.set()
 
     async def update_loop(self):
+        """
+        daten periodisch aktualisieren.
+
+        die daten werden alle update_interval sekunden aktualisiert.
+        das polling bleibt nötig, da neue züge und die simzeit nur so nachgeführt werden.
+
+        die meisten ereignisse werden von der planung inkrementell übernommen und lösen keine aktualisierung aus.
+        ereignisse, die die zusammensetzung der züge ändern (s. ereignis_erfordert_update),
+        ziehen die nächste aktualisierung vor, jedoch frühestens update_interval_min sekunden nach der letzten.
+
+        :return: None
+        """
+
         await self.zentrale.client.registered.wait()
         while self.enable_update:
+            self._update_vorziehen = trio.Event()
             try:
                 self.statusfeld.setText("Datenübertragung...")
                 await self.zentrale.update()
@@ -287,7 +304,9 @@ class MainWindow(QtWidgets.QMainWindow):
                 self.einstellungen_button.setEnabled(self.enable_update)
 
             self.statusfeld.setText("")
-            await trio.sleep(self.update_interval)
+            await trio.sleep(self.update_interval_min)
+            with trio.move_on_after(self.update_interval - self.update_interval_min):
+                await self._update_vorziehen.wait()
 
         self.statusfeld.setText("Keine Verbindung")
 
@@ -295,6 +314,21 @@ class MainWindow(QtWidgets.QMainWindow):
         await self.zentrale.client.registered.wait()
         async for ereignis in self.zentrale.client._ereignis_channel_out:
             await self.zentrale.ereignis(ereignis)
+            if self.ereignis_erfordert_update(ereignis):
+                self._update_vorziehen.set()
+
+    def ereignis_erfordert_update(self, ereignis: Ereignis) -> bool:
+        """
+        prüfen, ob ein ereignis nur mit einer vollen aktualisierung verarbeitet werden kann.
+
+        das ist der fall, wenn züge gekuppelt oder geflügelt werden
+        oder wenn das ereignis einen zug betrifft, der noch nicht in der zugliste steht.
+
+        :param ereignis: ereignis vom simulator
+        :return: True, wenn die nächste aktualisierung vorgezogen werden soll.
+        """
+
+        return ereignis.art in {'kuppeln', 'fluegeln'} or ereignis.zid not in self.zentrale.client.zugliste
 
 
 def parse_args(arguments: Sequence[str]) -> argparse.Namespace:
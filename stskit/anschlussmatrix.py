@@ -382,7 +382,7 @@ class Anschlussmatrix:
             item.set_fontsize('small')
 
         ax.figure.tight_layout()
-        ax.figure.canvas.draw()
+        ax.figure.canvas.draw_idle()
 
     def _make_auswahl_matrix(self, auswahl: Iterable[Tuple[int, int]]):
         """
@@ -21,14 +21,18 @@ class FahrzeitAuswertung:
 
     messdaten werden per gleis hinzugefügt, können aber auch per gruppe ausgewertet werden.
     die gruppenzuordnung muss vor den daten definiert werden.
+
+    die resultate von get_fahrzeit werden zwischengespeichert, bis neue messdaten oder gruppen gesetzt werden.
     """
 
     def __init__(self):
         self.gleis_zeiten = nx.DiGraph()
         self.bahnhof_zeiten = nx.DiGraph()
         self.gruppen: Dict[str, str] = {}
+        self._fahrzeit_cache: Dict[Tuple[str, str], float] = {}
 
     def set_koordinaten(self, koordinaten: Mapping[str, Iterable[str]]) -> None:
+        self._fahrzeit_cache = {}
         self.gruppen = {}
         for gruppe, gleise in koordinaten.items():
             for gleis in gleise:
@@ -48,6 +52,7 @@ class FahrzeitAuswertung:
         try:
             self._add_edge_stats(self.bahnhof_zeiten, self.gruppen[start], self.gruppen[ziel], fahrzeit)
             self._add_edge_stats(self.gleis_zeiten, start, ziel, fahrzeit)
+            self._fahrzeit_cache = {}
             logger.debug(f"add_fahrzeit({zug.name}, {start}, {ziel}, {fahrzeit})")
         except KeyError:
             logger.debug(f"add_fahrzeit: fehlende gruppenzuordnung für {start} oder {ziel}")
@@ -110,6 +115,11 @@ class FahrzeitAuswertung:
             numpy.nan, wenn keine passende verbindung gefunden wurde.
         """
 
+        try:
+            return self._fahrzeit_cache[(start, ziel)]
+        except KeyError:
+            pass
+
         fahrzeiten = []
         fahrzeiten.extend(self._get_graph_fahrzeit(self.gleis_zeiten, start, ziel))
 
@@ -121,7 +131,8 @@ class FahrzeitAuswertung:
         else:
             fahrzeiten.extend(self._get_graph_fahrzeit(self.bahnhof_zeiten, start_bahnhof, ziel_bahnhof))
 
-        return min(fahrzeiten, default=np.nan)
+        fahrzeit = self._fahrzeit_cache[(start, ziel)] = min(fahrzeiten, default=np.nan)
+        return fahrzeit
 
     @staticmethod
     def _get_graph_fahrzeit(graph, start, ziel):
@@ -184,6 +184,10 @@ class BildFahrplanWindow(QtWidgets.QMainWindow):
         self.ui.nachlaufzeit_spin.valueChanged.connect(self.nachlaufzeit_changed)
 
         self._axes = self.display_canvas.figure.subplots()
+        # tick-objekte werden nach axes.clear() wiederverwendet
+        self._zeit_formatter = mpl.ticker.FuncFormatter(hour_minutes_formatter)
+        self._zeit_minor_locator = mpl.ticker.MultipleLocator(1)
+        self._zeit_major_locator = mpl.ticker.MultipleLocator(5)
         self.display_canvas.mpl_connect("button_press_event", self.on_button_press)
         self.display_canvas.mpl_connect("button_release_event", self.on_button_release)
         self.display_canvas.mpl_connect("pick_event", self.on_pick)
@@ -511,9 +515,9 @@ class BildFahrplanWindow(QtWidgets.QMainWindow):
         x_labels_pos = self._distanz
 
         self._axes.set_xticks(x_labels_pos, x_labels, rotation=45, horizontalalignment='right')
-        self._axes.yaxis.set_major_formatter(hour_minutes_formatter)
-        self._axes.yaxis.set_minor_locator(mpl.ticker.MultipleLocator(1))
-        self._axes.yaxis.set_major_locator(mpl.ticker.MultipleLocator(5))
+        self._axes.yaxis.set_major_formatter(self._zeit_formatter)
+        self._axes.yaxis.set_minor_locator(self._zeit_minor_locator)
+        self._axes.yaxis.set_major_locator(self._zeit_major_locator)
         self._axes.yaxis.grid(True, which='major')
         self._axes.xaxis.grid(True)
 
@@ -583,7 +587,7 @@ class BildFahrplanWindow(QtWidgets.QMainWindow):
             self._trasse_markieren(tr, farbe)
 
         self._axes.figure.tight_layout()
-        self._axes.figure.canvas.draw()
+        self._axes.figure.canvas.draw_idle()
 
     def _trasse_markieren(self, trasse: Trasse, farbe: str):
         """
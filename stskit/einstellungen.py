@@ -5,7 +5,7 @@ datenstrukturen und fenster für anschlussmatrix
 """
 
 import logging
-from typing import Any, Dict, Generator, Iterable, List, Mapping, Optional, Set, Tuple, Type, Union
+from typing import Any, Dict, FrozenSet, Generator, Iterable, List, Mapping, Optional, Set, Tuple, Type, Union
 
 from PyQt5 import QtCore, QtWidgets
 from PyQt5.QtCore import pyqtSlot
@@ -27,49 +27,58 @@ class EinstellungenWindow(QtWidgets.QMainWindow):
 
         self.zentrale = zentrale
 
-        self.in_update = True
         self.ui = Ui_EinstellungenWindow()
         self.ui.setupUi(self)
 
-        # not implemented yet
-        self.ui.tab_widget.removeTab(2)
-        self.ui.tab_widget.removeTab(1)
-        self.ui.tab_widget.removeTab(0)
-
         self.setWindowTitle(f"Einstellungen {self.anlage.anlage.name}")
 
         self.zugschema = Zugschema()
         self.zugschema.load_config(self.anlage.zugschema.name)
-        self.zugschema_namen_nach_titel = {titel: name for name, titel in Zugschema.schematitel.items()}
+        self.zugschema_namen_nach_titel: Dict[str, str] = {}
+        self.zugschema_titel: List[str] = []
+        self._schematitel_stand: Optional[FrozenSet[Tuple[str, str]]] = None
         self.zugschema_modell = ZugschemaBearbeitungModell(None, zugschema=self.zugschema)
         self.ui.zugschema_details_table.setModel(self.zugschema_modell)
         self.ui.zugschema_name_combo.currentIndexChanged.connect(self.zugschema_changed)
 
         self.update_widgets()
-        self.in_update = False
 
     @property
     def anlage(self) -> Anlage:
         return self.zentrale.anlage
 
-    def update_widgets(self):
-        self.in_update = True
+    def _schemas_aktualisieren(self) -> bool:
+        """
+        titelliste der zugschemas nachführen, wenn sich Zugschema.schematitel geändert hat.
+
+        :return: True, wenn sich die schemas seit dem letzten aufruf geändert haben.
+        """
+
+        stand = frozenset(Zugschema.schematitel.items())
+        if stand == self._schematitel_stand:
+            return False
 
-        schemas = sorted(self.zugschema_namen_nach_titel.keys())
-        self.ui.zugschema_name_combo.clear()
-        self.ui.zugschema_name_combo.addItems(schemas)
-        self.ui.zugschema_name_combo.setCurrentText(self.zugschema.titel)
+        self._schematitel_stand = stand
+        self.zugschema_namen_nach_titel = {titel: name for name, titel in Zugschema.schematitel.items()}
+        self.zugschema_titel = sorted(self.zugschema_namen_nach_titel.keys())
+        return True
 
-        self.in_update = False
+    def update_widgets(self):
+        combo = self.ui.zugschema_name_combo
+        combo.blockSignals(True)
+        try:
+            if self._schemas_aktualisieren():
+                combo.clear()
+                combo.addItems(self.zugschema_titel)
+            combo.setCurrentText(self.zugschema.titel)
+        finally:
+            combo.blockSignals(False)
 
         self.ui.zugschema_details_table.resizeColumnsToContents()
         self.ui.zugschema_details_table.resizeRowsToContents()
 
     @pyqtSlot()
     def zugschema_changed(self):
-        if self.in_update:
-            return
-
         titel = self.ui.zugschema_name_combo.currentText()
         try:
             name = self.zugschema_namen_nach_titel[titel]
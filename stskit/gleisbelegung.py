@@ -353,6 +353,9 @@ class GleisauswahlModell(QtCore.QAbstractItemModel):
 
 class GleisbelegungWindow(QtWidgets.QMainWindow):
 
+    # argumente für axes.bar, die bei jedem update gleich bleiben
+    BALKEN_KWARGS = {'align': 'center', 'alpha': 0.5, 'width': 1.0}
+
     def __init__(self, zentrale: DatenZentrale):
         super().__init__()
 
@@ -404,6 +407,10 @@ class GleisbelegungWindow(QtWidgets.QMainWindow):
         self.ui.nachlaufzeit_spin.valueChanged.connect(self.nachlaufzeit_changed)
 
         self._axes = self.display_canvas.figure.subplots()
+        # tick-objekte werden nach axes.clear() wiederverwendet
+        self._zeit_formatter = mpl.ticker.FuncFormatter(hour_minutes_formatter)
+        self._zeit_minor_locator = mpl.ticker.MultipleLocator(1)
+        self._zeit_major_locator = mpl.ticker.MultipleLocator(5)
         self.display_canvas.mpl_connect("button_press_event", self.on_button_press)
         self.display_canvas.mpl_connect("button_release_event", self.on_button_release)
         self.display_canvas.mpl_connect("pick_event", self.on_pick)
@@ -510,10 +517,7 @@ class GleisbelegungWindow(QtWidgets.QMainWindow):
 
         self._axes.clear()
 
-        kwargs = dict()
-        kwargs['align'] = 'center'
-        kwargs['alpha'] = 0.5
-        kwargs['width'] = 1.0
+        kwargs = self.BALKEN_KWARGS
 
         if self.belegte_gleise_zeigen:
             gleise = [gleis for gleis in self._gleise if gleis in self.belegung.belegte_gleise]
@@ -522,7 +526,8 @@ class GleisbelegungWindow(QtWidgets.QMainWindow):
         slots = [slot for slot in self.belegung.slots.values() if slot.gleis in gleise]
         x_labels = gleise
         x_labels_pos = list(range(len(x_labels)))
-        x_pos = np.asarray([gleise.index(slot.gleis) for slot in slots])
+        gleis_index = {gleis: i for i, gleis in enumerate(gleise)}
+        x_pos = np.fromiter((gleis_index[slot.gleis] for slot in slots), dtype=int, count=len(slots))
 
         y_bot = np.asarray([slot.zeit for slot in slots])
         y_hgt = np.asarray([slot.dauer for slot in slots])
@@ -538,9 +543,9 @@ class GleisbelegungWindow(QtWidgets.QMainWindow):
         colors = [colors[slot] for slot in slots]
 
         self._axes.set_xticks(x_labels_pos, x_labels, rotation=45, horizontalalignment='right')
-        self._axes.yaxis.set_major_formatter(hour_minutes_formatter)
-        self._axes.yaxis.set_minor_locator(mpl.ticker.MultipleLocator(1))
-        self._axes.yaxis.set_major_locator(mpl.ticker.MultipleLocator(5))
+        self._axes.yaxis.set_major_formatter(self._zeit_formatter)
+        self._axes.yaxis.set_minor_locator(self._zeit_minor_locator)
+        self._axes.yaxis.set_major_locator(self._zeit_major_locator)
         self._axes.yaxis.grid(True, which='major')
         self._axes.xaxis.grid(True)
 
@@ -569,7 +574,7 @@ class GleisbelegungWindow(QtWidgets.QMainWindow):
             self._axes.axhline(y=zeit, color=mpl.rcParams['axes.edgecolor'], linewidth=mpl.rcParams['axes.linewidth'])
 
         self._axes.figure.tight_layout()
-        self._axes.figure.canvas.draw()
+        self._axes.figure.canvas.draw_idle()
 
     def _plot_sperrungen(self, x_labels, x_labels_pos, kwargs):
         """
@@ -144,6 +144,6 @@ class GleisnetzWindow(QtWidgets.QMainWindow):
                                              bbox=bbox, ax=self._axes)
 
             self._axes.figure.tight_layout()
-            self._axes.figure.canvas.draw()
+            self._axes.figure.canvas.draw_idle()
         except AttributeError:
             pass
@@ -1,9 +1,12 @@
+import collections
 from dataclasses import dataclass
 import datetime
+import itertools
 import json
 import logging
 import os
-from typing import Any, Callable, Dict, Generator, Iterable, List, Mapping, NamedTuple, Optional, Set, Tuple, Type, Union
+import sys
+from typing import Any, Callable, Dict, FrozenSet, Generator, Iterable, List, Mapping, NamedTuple, Optional, Set, Tuple, Type, Union
 import weakref
 
 import numpy as np
@@ -11,7 +14,7 @@ import networkx as nx
 import trio
 
 from stskit.stsobj import ZugDetails, FahrplanZeile, Ereignis
-from stskit.stsobj import time_to_minutes, time_to_seconds, minutes_to_time, seconds_to_time
+from stskit.stsobj import time_to_minutes, minutes_to_time
 from stskit.stsplugin import PluginClient, TaskDone
 from stskit.auswertung import Auswertung
 
@@ -55,6 +58,15 @@ class ZugZielNode(NamedTuple):
         :return: ZugZielNode
         """
 
+        if plangleis is None and zid is None and zielnr is None:
+            # der schlüssel ist unveränderlich, sobald die zielnummer vergeben ist
+            node = ziel._node_key
+            if node is None:
+                node = cls(ziel.zug.zid, ziel.zielnr, ziel.plan)
+                if ziel.zielnr is not None:
+                    ziel._node_key = node
+            return node
+
         if plangleis is None:
             plangleis = ziel.plan
 
@@ -72,7 +84,8 @@ class ZugZielNode(NamedTuple):
             typ = 'E'
         elif ziel.ausfahrt:
             typ = 'A'
-        elif ziel.zielnr > int(ziel.zielnr / 1000) * 1000:
+        elif ziel.zielnr % 1000:
+            # vom fdl eingefuegte ziele haben eine zielnummer zwischen den tausendern
             typ = 'B'
         elif ziel.durchfahrt():
             typ = 'D'
@@ -88,13 +101,9 @@ class ZugZielNode(NamedTuple):
         :param ziel: ZugZielPlanung-objekt
         :return: dict
         """
-        try:
-            plan_an = time_to_minutes(ziel.an)
-        except AttributeError:
-            plan_an = None
-        try:
-            plan_ab = time_to_minutes(ziel.ab)
-        except AttributeError:
+        plan_an = ziel.an_minute_plan
+        plan_ab = ziel.ab_minute_plan
+        if plan_ab is None:
             plan_ab = plan_an
         if plan_an is None:
             plan_an = plan_ab
@@ -125,6 +134,72 @@ def graph_succ_filter_flag(graph: nx.DiGraph, node: ZugZielNode, typ: str) -> It
             yield zzid
 
 
+def csr_topologisch_sortieren(indptr: np.ndarray, indices: np.ndarray) -> Tuple[np.ndarray, List[int]]:
+    """
+    topologische sortierung eines graphen in CSR-darstellung nach generationen (algorithmus von kahn)
+
+    die knoten sind von 0 bis n-1 durchnummeriert.
+    die nachfolger von knoten i sind indices[indptr[i]:indptr[i+1]].
+    alle knoten einer generation werden gemeinsam mit numpy-operationen abgebaut.
+    innerhalb einer generation sind die knoten nach nummer sortiert.
+
+    :param indptr: int-array der länge n+1
+    :param indices: int-array der kantenziele
+    :return: tupel aus sortierten knotennummern und offsets der generationen in der sortierung
+    :raise: nx.NetworkXUnfeasible, wenn der graph zyklen enthält.
+    """
+
+    n = len(indptr) - 1
+    eingangsgrad = np.bincount(indices, minlength=n)
+    generation = np.flatnonzero(eingangsgrad == 0)
+    generationen = []
+    grenzen = [0]
+
+    while len(generation):
+        generationen.append(generation)
+        grenzen.append(grenzen[-1] + len(generation))
+
+        starts = indptr[generation]
+        laengen = indptr[generation + 1] - starts
+        anzahl = laengen.sum()
+        if anzahl == 0:
+            break
+        offsets = np.repeat(starts - np.cumsum(laengen) + laengen, laengen)
+        nachfolger = indices[offsets + np.arange(anzahl)]
+        np.subtract.at(eingangsgrad, nachfolger, 1)
+        kandidaten = np.unique(nachfolger)
+        generation = kandidaten[eingangsgrad[kandidaten] == 0]
+
+    if grenzen[-1] < n:
+        raise nx.NetworkXUnfeasible("graph contains a cycle")
+
+    if generationen:
+        sortierung = np.concatenate(generationen)
+    else:
+        sortierung = np.zeros(0, dtype=np.intp)
+    return sortierung, grenzen
+
+
+# korrektur-codes für die vektorisierte verspätungsberechnung (s. VerspaetungsKorrektur.KIND)
+KORR_UEBERSPRINGEN = -1
+KORR_PYTHON = 0
+KORR_DURCHFAHRT = 1
+KORR_PLANHALT = 2
+KORR_EINFAHRT = 3
+KORR_FLUEGELUNG = 4
+
+
+class PlanungKontext(NamedTuple):
+    """
+    während eines berechnungsdurchgangs unveränderliche planungsdaten
+
+    der kontext wird vom aufrufer einmal pro durchgang erstellt und an die korrekturen weitergereicht,
+    damit diese nicht bei jedem ziel über die planung darauf zugreifen müssen.
+    """
+
+    simzeit_minuten: int
+
+
 class VerspaetungsKorrektur:
     """
     basisklasse für die anpassung der verspätungszeit eines fahrplanziels
@@ -135,11 +210,21 @@ class VerspaetungsKorrektur:
 
     über das _planung-attribut hat die klasse zugriff auf die ganze zugliste.
     sie darf jedoch nur das angegebene ziel sowie allfällige verknüpfte züge direkt ändern.
+    die planung wird nur schwach referenziert,
+    damit die zyklen planung - ziel - korrektur über den referenzzähler abgebaut werden.
 
+    das klassenattribut KIND gibt an, ob und wie die berechnung in der vektorisierten verspätungsberechnung
+    ausgeführt werden kann (s. abfahrt_vektoriell).
+    klassen mit KORR_PYTHON werden über die methoden ankunft_berechnen und abfahrt_berechnen berechnet.
+    abgeleitete klassen, die die berechnung ändern, müssen KIND entsprechend überschreiben.
     """
+
+    __slots__ = ('_planung_ref', 'edge_typ', 'rang', 'display_name', '_node')
+    KIND: int = KORR_PYTHON
+
     def __init__(self, planung: 'Planung'):
         # super().__init__()
-        self._planung = planung
+        self._planung_ref = weakref.ref(planung)
         self.edge_typ = ""
         self.rang: int = 0
         self.display_name = "Default"
@@ -148,6 +233,10 @@ class VerspaetungsKorrektur:
     def __str__(self):
         return self.display_name
 
+    @property
+    def _planung(self) -> 'Planung':
+        return self._planung_ref()
+
     @property
     def node(self) -> ZugZielNode:
         return self._node
@@ -179,54 +268,66 @@ class VerspaetungsKorrektur:
             except AttributeError:
                 return self.node
 
-    def ankunft_berechnen(self, graph: nx.DiGraph, node: ZugZielNode, node_data: Dict[str, Any]):
+    def ankunft_berechnen(self, graph: nx.DiGraph, node: ZugZielNode, node_data: Dict[str, Any],
+                          kontext: Optional[PlanungKontext] = None):
         """
         ankunftsverspätung berechnen
 
         die methode erhält den zielgraphen mit schlüssel und zieldaten.
         die methode berechnet die ankunftsverspätung v_an am angegebenen fahrziel.
         sie darf dazu die daten von allen eingehenden kanten des zielgraphen verwenden.
+        daten der planung, die während eines durchgangs konstant sind, liest sie wenn möglich aus dem kontext.
 
         in dieser klasse ist eine default-verarbeitung implementiert,
         die die ankunftsverspätung von eingehenden P-kanten übernimmt,
         entsprechend einem regulären ziel, ohne die verspätung aufzuholen.
         """
 
+        # direkter zugriff auf die adjazenz-dicts von networkx, ohne view-objekte
+        knoten_daten = graph._node
+        # laufendes maximum über die vorgänger, ohne zwischenliste und max-aufruf pro kante.
+        # None solange keine kante beigetragen hat, danach mindestens 0.
         ankunft = None
-        for pred in graph.pred[node]:
+        for pred, edge_data in graph._pred[node].items():
             try:
-                pred_data = graph.nodes[pred]
+                pred_data = knoten_daten[pred]
                 pred_v_ab = pred_data['v_ab']
                 pred_v_an = pred_data['v_an']
                 pred_p_an = pred_data['p_an']
                 pred_p_ab = pred_data['p_ab']
-                edge_data = graph[pred][node]
                 edge_typ = edge_data['typ']
             except KeyError:
                 continue
+
+            if edge_typ == 'P':
+                # gleiche verspaetung wie vorgaenger
+                kandidat = node_data['p_an'] + pred_v_ab
+            elif edge_typ == 'E':
+                # ankunft ist gleich abfahrt des vorgaengers
+                try:
+                    kandidat = pred_p_ab + pred_v_ab
+                except TypeError:
+                    logger.warning(f"ankunft berechnen: stammzug hat keine abfahrtszeit {pred_data}")
+                    continue
+            elif edge_typ == 'F':
+                # ankunft ist gleich ankunft des vorgaengers
+                kandidat = pred_p_an + pred_v_an
             else:
-                if edge_typ == 'P':
-                    # gleiche verspaetung wie vorgaenger
-                    ankunft = max(ankunft or 0, node_data['p_an'] + pred_v_ab)
-                elif edge_typ == 'E':
-                    # ankunft ist gleich abfahrt des vorgaengers
-                    try:
-                        ankunft = max(ankunft or 0, pred_p_ab + pred_v_ab)
-                    except TypeError:
-                        logger.warning(f"ankunft berechnen: stammzug hat keine abfahrtszeit {pred_data}")
-                elif edge_typ == 'F':
-                    # ankunft ist gleich ankunft des vorgaengers
-                    ankunft = max(ankunft or 0, pred_p_an + pred_v_an)
-                elif edge_typ == 'K':
-                    # ankunft des kuppelziels haengt nicht vom kuppelnden zug ab
-                    pass
+                # K: ankunft des kuppelziels haengt nicht vom kuppelnden zug ab
+                continue
+
+            if ankunft is None:
+                ankunft = kandidat if kandidat > 0 else 0
+            elif kandidat > ankunft:
+                ankunft = kandidat
 
         if ankunft is not None:
             node_data['v_an'] = ankunft - node_data['p_an']
 
         logger.debug(f"{self.__class__.__name__}.ankunft_berechnen: {node}, {node_data}")
 
-    def abfahrt_berechnen(self, graph: nx.DiGraph, node: ZugZielNode, node_data: Dict[str, Any]):
+    def abfahrt_berechnen(self, graph: nx.DiGraph, node: ZugZielNode, node_data: Dict[str, Any],
+                          kontext: Optional[PlanungKontext] = None):
         """
         abfahrtsverspätung berechnen
 
@@ -236,6 +337,7 @@ class VerspaetungsKorrektur:
         anfangs ist v_ab = v_an.
         der werte sollte wenn nötig via max-funktion erhöht werden und
         nur in speziellen fällen bedingungslos überschrieben oder verkleinert werden.
+        daten der planung, die während eines durchgangs konstant sind, liest sie wenn möglich aus dem kontext.
 
         in dieser klasse ist eine default-verarbeitung implementiert,
         die lediglich ankunftsverspätung übernimmt,
@@ -255,6 +357,9 @@ class Durchfahrt(VerspaetungsKorrektur):
     die verspätung wird durchgereicht.
     """
 
+    __slots__ = ()
+    KIND = KORR_DURCHFAHRT
+
     def __init__(self, planung: 'Planung'):
         super().__init__(planung)
         self.display_name = "Durchfahrt"
@@ -268,11 +373,15 @@ class Planhalt(VerspaetungsKorrektur):
     die verspätung wird soweit möglich reduziert, ohne die mindestaufenthaltsdauer zu unterschreiten.
     """
 
+    __slots__ = ()
+    KIND = KORR_PLANHALT
+
     def __init__(self, planung: 'Planung'):
         super().__init__(planung)
         self.display_name = "Planhalt"
 
-    def abfahrt_berechnen(self, graph: nx.DiGraph, node: ZugZielNode, node_data: Dict[str, Any]):
+    def abfahrt_berechnen(self, graph: nx.DiGraph, node: ZugZielNode, node_data: Dict[str, Any],
+                          kontext: Optional[PlanungKontext] = None):
         ankunft = node_data['p_an'] + node_data['v_an']
         v_ab = max(0, node_data['d_min'] + ankunft - node_data['p_ab'])
         node_data['v_ab'] = v_ab
@@ -292,6 +401,8 @@ class FesteVerspaetung(VerspaetungsKorrektur):
     die korrektur ist nicht geeignet in kombination mit anderen abhängigkeiten.
     """
 
+    __slots__ = ('verspaetung',)
+
     def __init__(self, planung: 'Planung'):
         super().__init__(planung)
         self.verspaetung: int = 0
@@ -300,7 +411,8 @@ class FesteVerspaetung(VerspaetungsKorrektur):
     def __str__(self):
         return f"{self.display_name}({self.verspaetung})"
 
-    def abfahrt_berechnen(self, graph: nx.DiGraph, node: ZugZielNode, node_data: Dict[str, Any]):
+    def abfahrt_berechnen(self, graph: nx.DiGraph, node: ZugZielNode, node_data: Dict[str, Any],
+                          kontext: Optional[PlanungKontext] = None):
         logger.debug(f"{self.__class__.__name__}.abfahrt_berechnen: {node}, {node_data}")
         node_data['v_ab'] = self.verspaetung
 
@@ -315,6 +427,8 @@ class Signalhalt(FesteVerspaetung):
     der andere name und objekt-string dient der unterscheidung.
     """
 
+    __slots__ = ()
+
     def __init__(self, planung: 'Planung'):
         super().__init__(planung)
         self.display_name = "Signalhalt"
@@ -328,16 +442,23 @@ class Einfahrtszeit(VerspaetungsKorrektur):
     in diesem fall erhöht diese korrektur die verspätung, so dass die einfahrtszeit der aktuellen uhrzeit entspricht.
     """
 
+    __slots__ = ()
+    KIND = KORR_EINFAHRT
+
     def __init__(self, planung: 'Planung'):
         super().__init__(planung)
         self.display_name = "Einfahrt"
 
-    def ankunft_berechnen(self, graph: nx.DiGraph, node: ZugZielNode, node_data: Dict[str, Any]):
+    def ankunft_berechnen(self, graph: nx.DiGraph, node: ZugZielNode, node_data: Dict[str, Any],
+                          kontext: Optional[PlanungKontext] = None):
         logger.debug(f"{self.__class__.__name__}.ankunft_berechnen: {node}, {node_data}")
 
-    def abfahrt_berechnen(self, graph: nx.DiGraph, node: ZugZielNode, node_data: Dict[str, Any]):
+    def abfahrt_berechnen(self, graph: nx.DiGraph, node: ZugZielNode, node_data: Dict[str, Any],
+                          kontext: Optional[PlanungKontext] = None):
+        if kontext is None:
+            kontext = self._planung.kontext()
         ankunft = node_data['p_an'] + node_data['v_an']
-        abfahrt = max(ankunft, self._planung.simzeit_minuten)
+        abfahrt = max(ankunft, kontext.simzeit_minuten)
         node_data['v_ab'] = abfahrt - node_data['p_ab']
         logger.debug(f"{self.__class__.__name__}.abfahrt_berechnen: {node}, {node_data}")
 
@@ -358,6 +479,8 @@ class AbhaengigkeitsZiel:
     - ursprung_name: name des verknuepften zuges - fuer anzeige
     """
 
+    __slots__ = ()
+
     def __init__(self, planung: 'Planung'):
         super().__init__(planung)
         self._ursprung: Optional[ZugZielNode] = None
@@ -399,6 +522,8 @@ class AbhaengigkeitsUrsprung:
     - folge_name: name des verknuepften zuges - fuer anzeige
     """
 
+    __slots__ = ()
+
     def __init__(self, planung: 'Planung'):
         super().__init__(planung)
         self._folge: Optional[ZugZielNode] = None
@@ -443,6 +568,8 @@ class ZugAbwarten(VerspaetungsKorrektur, AbhaengigkeitsZiel):
     - wartezeit: wartezeit nach ankunft des abzuwartenden zuges
     """
 
+    __slots__ = ('_ursprung', 'wartezeit')
+
     def __init__(self, planung: 'Planung'):
         super().__init__(planung)
         self.edge_typ = "A"
@@ -452,7 +579,8 @@ class ZugAbwarten(VerspaetungsKorrektur, AbhaengigkeitsZiel):
     def __str__(self):
         return f"{self.display_name}({self.ursprung_name}, {self._ursprung.plangleis}, {self.wartezeit})"
 
-    def ankunft_berechnen(self, graph: nx.DiGraph, node: ZugZielNode, node_data: Dict[str, Any]):
+    def ankunft_berechnen(self, graph: nx.DiGraph, node: ZugZielNode, node_data: Dict[str, Any],
+                          kontext: Optional[PlanungKontext] = None):
         """
         ankunft wird von dieser korrektur nicht beruehrt
 
@@ -463,7 +591,8 @@ class ZugAbwarten(VerspaetungsKorrektur, AbhaengigkeitsZiel):
         """
         logger.debug(f"{self.__class__.__name__}.ankunft_berechnen: {node}, {node_data}")
 
-    def abfahrt_berechnen(self, graph: nx.DiGraph, node: ZugZielNode, node_data: Dict[str, Any]):
+    def abfahrt_berechnen(self, graph: nx.DiGraph, node: ZugZielNode, node_data: Dict[str, Any],
+                          kontext: Optional[PlanungKontext] = None):
         """
         default-verarbeitung für abhängigkeiten
 
@@ -497,12 +626,15 @@ class AnkunftAbwarten(ZugAbwarten):
     - wartezeit: wartezeit nach ankunft des abzuwartenden zuges
     """
 
+    __slots__ = ()
+
     def __init__(self, planung: 'Planung'):
         super().__init__(planung)
         self.display_name = "Ankunft"
         self.wartezeit = planung.params.wartezeit_ankunft_abwarten
 
-    def abfahrt_berechnen(self, graph: nx.DiGraph, node: ZugZielNode, node_data: Dict[str, Any]):
+    def abfahrt_berechnen(self, graph: nx.DiGraph, node: ZugZielNode, node_data: Dict[str, Any],
+                          kontext: Optional[PlanungKontext] = None):
         ankunft = node_data['p_an'] + node_data['v_an']
         aufenthalt = max(node_data['p_ab'] - ankunft, node_data['d_min'])
         anschluss = graph.nodes[self.ursprung]
@@ -531,12 +663,15 @@ class AbfahrtAbwarten(ZugAbwarten):
     - wartezeit: wartezeit nach ankunft des abzuwartenden zuges
     """
 
+    __slots__ = ()
+
     def __init__(self, planung: 'Planung'):
         super().__init__(planung)
         self.display_name = "Abfahrt"
         self.wartezeit = planung.params.wartezeit_abfahrt_abwarten
 
-    def abfahrt_berechnen(self, graph: nx.DiGraph, node: ZugZielNode, node_data: Dict[str, Any]):
+    def abfahrt_berechnen(self, graph: nx.DiGraph, node: ZugZielNode, node_data: Dict[str, Any],
+                          kontext: Optional[PlanungKontext] = None):
         ankunft = node_data['p_an'] + node_data['v_an']
         aufenthalt = max(node_data['p_ab'] - ankunft, node_data['d_min'])
         anschluss = graph.nodes[self.ursprung]
@@ -556,6 +691,8 @@ class ZugNichtAbwarten(ZugAbwarten):
     sie hat keine auswirkung auf die verspätung.
     """
 
+    __slots__ = ()
+
     def __init__(self, planung: 'Planung'):
         super().__init__(planung)
         self.edge_typ = "X"
@@ -563,12 +700,17 @@ class ZugNichtAbwarten(ZugAbwarten):
 
 
 class FlagKorrektur(VerspaetungsKorrektur):
+    __slots__ = ()
+
     def __init__(self, planung: 'Planung'):
         super().__init__(planung)
         self.display_name = "Flag"
 
 
 class FlagUrsprung(FlagKorrektur, AbhaengigkeitsUrsprung):
+    __slots__ = ('_folge',)
+    KIND = KORR_DURCHFAHRT
+
     def __init__(self, planung: 'Planung'):
         super().__init__(planung)
         self.display_name = "Flag"
@@ -578,6 +720,8 @@ class FlagUrsprung(FlagKorrektur, AbhaengigkeitsUrsprung):
 
 
 class FlagZiel(FlagKorrektur, AbhaengigkeitsZiel):
+    __slots__ = ('_ursprung',)
+
     def __init__(self, planung: 'Planung'):
         super().__init__(planung)
         self.display_name = "Flagziel"
@@ -596,12 +740,16 @@ class ErsatzUrsprung(FlagUrsprung):
     das erste fahrplanziel des ersatzzuges muss it einer ErsatzZiel-korrektur markiert sein.
     """
 
+    __slots__ = ()
+    KIND = KORR_PLANHALT
+
     def __init__(self, planung: 'Planung'):
         super().__init__(planung)
         self.edge_typ = "E"
         self.display_name = "Ersatz"
 
-    def abfahrt_berechnen(self, graph: nx.DiGraph, node: ZugZielNode, node_data: Dict[str, Any]):
+    def abfahrt_berechnen(self, graph: nx.DiGraph, node: ZugZielNode, node_data: Dict[str, Any],
+                          kontext: Optional[PlanungKontext] = None):
         """
         abfahrtszeit = zeit des nummernwechsels
         """
@@ -624,12 +772,16 @@ class ErsatzZiel(FlagZiel):
     funkioniert in verbindung mit ErsatzUrsprung.
     """
 
+    __slots__ = ()
+    KIND = KORR_PLANHALT
+
     def __init__(self, planung: 'Planung'):
         super().__init__(planung)
         self.display_name = "Ersatz"
         self.rang = 1
 
-    def abfahrt_berechnen(self, graph: nx.DiGraph, node: ZugZielNode, node_data: Dict[str, Any]):
+    def abfahrt_berechnen(self, graph: nx.DiGraph, node: ZugZielNode, node_data: Dict[str, Any],
+                          kontext: Optional[PlanungKontext] = None):
         ankunft = node_data['p_an'] + node_data['v_an']
         aufenthalt = max(node_data['p_ab'] - ankunft, node_data['d_min'])
         abfahrt = ankunft + aufenthalt
@@ -639,6 +791,8 @@ class ErsatzZiel(FlagZiel):
 
 
 class FluegelungUrsprung(FlagUrsprung):
+    __slots__ = ()
+
     def __init__(self, planung: 'Planung'):
         super().__init__(planung)
         self.edge_typ = "F"
@@ -646,13 +800,17 @@ class FluegelungUrsprung(FlagUrsprung):
 
 
 class FluegelungZiel(FlagZiel):
+    __slots__ = ()
+    KIND = KORR_FLUEGELUNG
+
     def __init__(self, planung: 'Planung'):
         super().__init__(planung)
         self.edge_typ = "P"
         self.display_name = "Flügelung"
         self.rang = 2
 
-    def abfahrt_berechnen(self, graph: nx.DiGraph, node: ZugZielNode, node_data: Dict[str, Any]):
+    def abfahrt_berechnen(self, graph: nx.DiGraph, node: ZugZielNode, node_data: Dict[str, Any],
+                          kontext: Optional[PlanungKontext] = None):
         try:
             pred_data = graph.nodes[self.ursprung]
             pred_v_ab = pred_data['v_ab']
@@ -677,6 +835,8 @@ class KupplungUrsprung(FlagUrsprung):
     bemerkung: der zug mit dem kuppel-flag verschwindet. der verlinkte zug fährt weiter.
     """
 
+    __slots__ = ()
+
     def __init__(self, planung: 'Planung'):
         super().__init__(planung)
         self.edge_typ = "K"
@@ -692,13 +852,16 @@ class KupplungZiel(FlagZiel):
     bemerkung: der zug mit dem kuppel-flag verschwindet. der verlinkte zug fährt weiter.
     """
 
+    __slots__ = ()
+
     def __init__(self, planung: 'Planung'):
         super().__init__(planung)
         self.edge_typ = "P"
         self.display_name = "Kupplung"
         self.rang = 3
 
-    def abfahrt_berechnen(self, graph: nx.DiGraph, node: ZugZielNode, node_data: Dict[str, Any]):
+    def abfahrt_berechnen(self, graph: nx.DiGraph, node: ZugZielNode, node_data: Dict[str, Any],
+                          kontext: Optional[PlanungKontext] = None):
         try:
             ursprung_data = graph.nodes[self.ursprung]
             bereitschaft1 = ursprung_data['p_an'] + ursprung_data['v_an']
@@ -744,6 +907,9 @@ class ZugDetailsPlanung(ZugDetails):
         self.ausgefahren: bool = False
         self.folgezuege_aufgeloest: bool = False
         self.korrekturen_definiert: bool = False
+        self._zielnr_index: Dict[int, 'ZugZielPlanung'] = {}
+        self._plan_index: Dict[str, 'ZugZielPlanung'] = {}
+        self._route_plan_index: Dict[str, int] = {}
 
     @property
     def einfahrtszeit(self) -> datetime.time:
@@ -807,8 +973,8 @@ class ZugDetailsPlanung(ZugDetails):
         """
         self.zid = zug.zid
         self.name = zug.name
-        self.von = zug.von.replace("Gleis ", "") if zug.von else ""
-        self.nach = zug.nach.replace("Gleis ", "") if zug.nach else ""
+        self.von = sys.intern(zug.von.replace("Gleis ", "")) if zug.von else ""
+        self.nach = sys.intern(zug.nach.replace("Gleis ", "")) if zug.nach else ""
         self.hinweistext = zug.hinweistext
 
         self.fahrplan = []
@@ -819,6 +985,7 @@ class ZugDetailsPlanung(ZugDetails):
             ziel = ZugZielPlanung(self)
             self.fahrplan.append(ziel)
             ziel.einfahrt = True
+            ziel.gleistyp = 'Einfahrt'
             ziel.variable_zeit = True
             ziel.plan = ziel.gleis = self.von
             try:
@@ -849,17 +1016,25 @@ class ZugDetailsPlanung(ZugDetails):
             except IndexError:
                 pass
             ziel.ausfahrt = True
+            if not ziel.einfahrt:
+                ziel.gleistyp = 'Ausfahrt'
 
+        self._zielnr_index = {}
+        self._plan_index = {}
+        self._route_plan_index = {}
         for n, z in enumerate(self.fahrplan):
             z.zielnr = n * 1000
+            self._zielnr_index[z.zielnr] = z
+            self._plan_index.setdefault(z.plan, z)
+            self._route_plan_index.setdefault(z.plan, n)
 
         # zug ist neu in liste und schon im stellwerk -> startaufstellung
         if zug.sichtbar:
-            ziel_index = self.find_fahrplan_index(plan=zug.plangleis)
+            ziel_index = self._route_plan_index.get(zug.plangleis)
             if ziel_index is None:
                 # ziel ist ausfahrt
                 ziel_index = -1
-            for ziel in self.fahrplan[0:ziel_index]:
+            for ziel in self.fahrplan_bis(ziel_index):
                 ziel.abgefahren = ziel.angekommen = True
                 ziel.verspaetung_ab = ziel.verspaetung_an = zug.verspaetung
             if zug.amgleis:
@@ -886,8 +1061,8 @@ class ZugDetailsPlanung(ZugDetails):
         """
 
         if zug.gleis:
-            self.gleis = zug.gleis
-            self.plangleis = zug.plangleis
+            self.gleis = sys.intern(zug.gleis)
+            self.plangleis = sys.intern(zug.plangleis)
         else:
             self.gleis = self.plangleis = self.nach
 
@@ -900,27 +1075,39 @@ class ZugDetailsPlanung(ZugDetails):
             self.usertextsender = zug.usertextsender
 
         for zeile in zug.fahrplan:
-            ziel = self.find_fahrplanzeile(plan=zeile.plan)
-            try:
+            ziel = self._plan_index.get(zeile.plan)
+            if ziel is not None:
                 ziel.update_fahrplan_zeile(zeile)
-            except AttributeError:
-                pass
 
-        route = list(self.route(plan=True))
+        # die plangleise aendern sich nach assign_zug_details nicht mehr
         try:
-            self.ziel_index = route.index(zug.plangleis)
-        except ValueError:
+            self.ziel_index = self._route_plan_index[zug.plangleis]
+        except KeyError:
             # zug faehrt aus
             if not zug.plangleis:
                 self.ziel_index = -1
         else:
             # falls ein ereignis vergessen gegangen ist, vergangene ziele markieren
             if self.sichtbar:
-                for ziel in self.fahrplan[0:max(0, self.ziel_index)]:
+                for ziel in self.fahrplan_bis(max(0, self.ziel_index)):
                     ziel.angekommen = ziel.angekommen or True
-                for ziel in self.fahrplan[0:max(0, self.ziel_index-1)]:
+                for ziel in self.fahrplan_bis(max(0, self.ziel_index-1)):
                     ziel.abgefahren = ziel.abgefahren or True
 
+    def fahrplan_bis(self, stop: Optional[int]) -> Iterable['ZugZielPlanung']:
+        """
+        fahrplanziele vor dem angegebenen index iterieren, ohne die liste zu kopieren
+
+        entspricht self.fahrplan[0:stop], inkl. negativer indizes und None.
+
+        :param stop: index des ersten nicht mehr gelieferten ziels
+        :return: iterator über die ziele
+        """
+
+        if stop is not None and stop < 0:
+            stop = max(0, len(self.fahrplan) + stop)
+        return itertools.islice(self.fahrplan, stop)
+
     def find_fahrplan_zielnr(self, zielnr: int) -> 'ZugZielPlanung':
         """
         fahrplaneintrag nach zielnummer suchen
@@ -930,12 +1117,47 @@ class ZugDetailsPlanung(ZugDetails):
         :raise: ValueError, wenn zielnr nicht gefunden wird.
         """
 
-        for ziel in self.fahrplan:
-            if ziel.zielnr == zielnr:
-                return ziel
-        else:
+        try:
+            return self._zielnr_index[zielnr]
+        except KeyError:
             raise ValueError(f"zielnr {zielnr} nicht gefunden in zug {self.name}")
 
+    def find_fahrplanzeile(self, gleis: Optional[str] = None, plan: Optional[str] = None) -> Optional['ZugZielPlanung']:
+        """
+        finde erste fahrplanzeile, in der ein bestimmtes gleis vorkommt.
+
+        wie ZugDetails.find_fahrplanzeile.
+        die suche nach dem plangleis allein verwendet den index von assign_zug_details,
+        die suche nach dem aktuellen gleis durchsucht den fahrplan.
+
+        :param gleis: (str)
+        :param plan: (str)
+
+        :return: ZugZielPlanung objekt oder None.
+        """
+
+        if gleis is None and self._plan_index:
+            return self._plan_index.get(plan)
+        return super().find_fahrplanzeile(gleis=gleis, plan=plan)
+
+    def find_fahrplan_index(self, gleis: Optional[str] = None, plan: Optional[str] = None) -> Optional[int]:
+        """
+        finde den index der ersten fahrplanzeile, in der ein bestimmtes gleis vorkommt.
+
+        wie ZugDetails.find_fahrplan_index.
+        die suche nach dem plangleis allein verwendet den index von assign_zug_details,
+        die suche nach dem aktuellen gleis durchsucht den fahrplan.
+
+        :param gleis: (str)
+        :param plan: (str)
+
+        :return: index in fahrplan-liste oder None.
+        """
+
+        if gleis is None and self._route_plan_index:
+            return self._route_plan_index.get(plan)
+        return super().find_fahrplan_index(gleis=gleis, plan=plan)
+
 
 class ZugZielPlanung(FahrplanZeile):
     """
@@ -961,6 +1183,9 @@ class ZugZielPlanung(FahrplanZeile):
 
     ausfahrt: zeigt an, ob das fahrziel die ausfahrt beschreibt.
 
+    gleistyp: 'Einfahrt', 'Ausfahrt' oder 'Gleis'.
+        wird von `ZugDetailsPlanung.assign_zug_details` zusammen mit einfahrt und ausfahrt gesetzt.
+
     variable_zeit: zeigt bei ein- und ausfahrten an, dass die ankunfts- und abfahrtszeiten geschätzt werden
         (methode `einfahrten_korrigieren`).
 
@@ -984,11 +1209,17 @@ class ZugZielPlanung(FahrplanZeile):
     """
 
     def __init__(self, zug: ZugDetails):
+        self._an: Optional[datetime.time] = None
+        self._ab: Optional[datetime.time] = None
+        self._an_min: Optional[int] = None
+        self._ab_min: Optional[int] = None
         super().__init__(zug)
 
         self.zielnr: Optional[int] = None
+        self._node_key: Optional[ZugZielNode] = None
         self.einfahrt: bool = False
         self.ausfahrt: bool = False
+        self.gleistyp: str = 'Gleis'
         self.variable_zeit: bool = False
         self.verspaetung_an: int = 0
         self.verspaetung_ab: int = 0
@@ -1042,8 +1273,8 @@ class ZugZielPlanung(FahrplanZeile):
         :param zeile: FahrplanZeile vom PluginClient
         :return: None
         """
-        self.gleis = zeile.gleis
-        self.plan = zeile.plan
+        self.gleis = sys.intern(zeile.gleis)
+        self.plan = sys.intern(zeile.plan)
         self.an = zeile.an
         self.ab = zeile.ab
         self.flags = zeile.flags
@@ -1066,7 +1297,53 @@ class ZugZielPlanung(FahrplanZeile):
         :param zeile: FahrplanZeile vom PluginClient
         :return: None
         """
-        self.gleis = zeile.gleis
+        self.gleis = sys.intern(zeile.gleis)
+
+    @property
+    def an(self) -> Optional[datetime.time]:
+        """
+        planmässige ankunftszeit
+
+        beim setzen wird die zeit auch in minuten umgerechnet (s. an_minute_plan).
+        """
+        return self._an
+
+    @an.setter
+    def an(self, an: Optional[datetime.time]):
+        self._an = an
+        self._an_min = time_to_minutes(an) if an is not None else None
+
+    @property
+    def ab(self) -> Optional[datetime.time]:
+        """
+        planmässige abfahrtszeit
+
+        beim setzen wird die zeit auch in minuten umgerechnet (s. ab_minute_plan).
+        """
+        return self._ab
+
+    @ab.setter
+    def ab(self, ab: Optional[datetime.time]):
+        self._ab = ab
+        self._ab_min = time_to_minutes(ab) if ab is not None else None
+
+    @property
+    def an_minute_plan(self) -> Optional[int]:
+        """
+        planmässige ankunftszeit in minuten
+
+        :return: minuten seit mitternacht oder None, wenn die zeitangabe fehlt.
+        """
+        return self._an_min
+
+    @property
+    def ab_minute_plan(self) -> Optional[int]:
+        """
+        planmässige abfahrtszeit in minuten
+
+        :return: minuten seit mitternacht oder None, wenn die zeitangabe fehlt.
+        """
+        return self._ab_min
 
     @property
     def ankunft_minute(self) -> Optional[int]:
@@ -1075,10 +1352,9 @@ class ZugZielPlanung(FahrplanZeile):
 
         :return: minuten seit mitternacht oder None, wenn die zeitangabe fehlt.
         """
-        try:
-            return time_to_minutes(self.an) + self.verspaetung_an
-        except AttributeError:
+        if self._an_min is None:
             return None
+        return self._an_min + self.verspaetung_an
 
     @property
     def abfahrt_minute(self) -> Optional[int]:
@@ -1087,10 +1363,9 @@ class ZugZielPlanung(FahrplanZeile):
 
         :return: minuten seit mitternacht oder None, wenn die zeitangabe fehlt.
         """
-        try:
-            return time_to_minutes(self.ab) + self.verspaetung_ab
-        except AttributeError:
+        if self._ab_min is None:
             return None
+        return self._ab_min + self.verspaetung_ab
 
     @property
     def verspaetung(self) -> int:
@@ -1103,15 +1378,6 @@ class ZugZielPlanung(FahrplanZeile):
         """
         return self.verspaetung_ab
 
-    @property
-    def gleistyp(self) -> str:
-        if self.einfahrt:
-            return 'Einfahrt'
-        elif self.ausfahrt:
-            return 'Ausfahrt'
-        else:
-            return 'Gleis'
-
     @property
     def angekommen(self) -> Union[bool, datetime.datetime]:
         """
@@ -1162,6 +1428,101 @@ class PlanungParams:
     wartezeit_abfahrt_abwarten: int = 2
 
 
+# zugbaum-flags und die entsprechenden attribute der fahrplanziele (s. _zugbaum_analysieren)
+FOLGEZUG_ATTRIBUTE: Dict[str, str] = {'E': 'ersatzzug', 'K': 'kuppelzug', 'F': 'fluegelzug'}
+
+# kantentypen, die in die ankunftsberechnung der vektorisierten ziele eingehen
+KANTEN_KIND: Dict[str, int] = {'P': 0, 'E': 1, 'F': 2}
+
+# markierung fehlender zeitangaben in minuten-arrays (gültige zeiten sind nie negativ)
+MINUTEN_FEHLT = -1
+
+
+class PlanArrays(NamedTuple):
+    """
+    zieldaten in spaltenform (struct of arrays) für die vektorisierte verspätungsberechnung
+
+    die zeilen entsprechen der reihenfolge von Planung.zielsortierung.
+    die spalten p_an, p_ab, d_min, v_an und v_ab entsprechen den gleichnamigen knotendaten im zielgraph.
+    fehlende zeitangaben sind in p_an und p_ab mit MINUTEN_FEHLT markiert.
+
+    korr_kind gibt an, wie die verspätung des ziels berechnet wird:
+    - KORR_UEBERSPRINGEN: ziel ohne fahrplan oder zeitangaben, wird nicht berechnet.
+    - KORR_PYTHON: ziel mit fdl-korrekturen oder abhängigkeiten, wird von den korrekturobjekten berechnet.
+    - KORR_DURCHFAHRT, KORR_PLANHALT, KORR_EINFAHRT, KORR_FLUEGELUNG: ziel wird vektorisiert berechnet.
+
+    ursprung enthält bei flügelungszielen die zeilennummer des stammziels, sonst -1.
+
+    kanten_ziel und kanten_quelle enthalten die zeilennummern der kanten, die in vektorisierte ziele führen,
+    kanten_typ den typ der kante gemäss KANTEN_KIND.
+    sie sind nach generationen des zielgraphen gruppiert, kanten_grenzen enthält die entsprechenden offsets.
+    innerhalb einer generation sind die kanten nach zielzeile geordnet,
+    so dass die kanten eines ziels ein zusammenhängendes segment bilden.
+
+    vorgaenger enthält zu jedem KORR_PYTHON-ziel die zeilennummern seiner vorgänger im zielgraph.
+    """
+
+    objekte: np.ndarray
+    daten: List[Dict[str, Any]]
+    index: Dict[ZugZielNode, int]
+    korr_kind: np.ndarray
+    p_an: np.ndarray
+    p_ab: np.ndarray
+    d_min: np.ndarray
+    v_an: np.ndarray
+    v_ab: np.ndarray
+    angekommen: np.ndarray
+    abgefahren: np.ndarray
+    ursprung: np.ndarray
+    kanten_ziel: np.ndarray
+    kanten_quelle: np.ndarray
+    kanten_typ: np.ndarray
+    kanten_grenzen: List[int]
+    vorgaenger: Dict[int, Tuple[int, ...]]
+
+
+def spalte_minuten(daten: Iterable[Mapping[str, Any]], key: str) -> np.ndarray:
+    """
+    zeitangaben in minuten aus knotendaten in ein int32-array übertragen
+
+    :param daten: knotendaten des zielgraphen, z.b. in der reihenfolge der zielsortierung
+    :param key: schlüssel der zeitangabe, z.b. 'p_an'
+    :return: array mit minuten, fehlende angaben (None oder fehlender schlüssel) sind MINUTEN_FEHLT
+    """
+
+    return np.fromiter((MINUTEN_FEHLT if (minuten := data.get(key)) is None else minuten for data in daten),
+                       dtype=np.int32)
+
+
+def abfahrt_vektoriell(kind: int, arrays: PlanArrays, rows: np.ndarray, kontext: PlanungKontext):
+    """
+    abfahrtsverspätung von zielen mit gleichem korrektur-code vektorisiert berechnen
+
+    die funktion entspricht den abfahrt_berechnen-methoden der korrekturklassen mit dem angegebenen KIND.
+    die ankunftsverspätung der ziele und die daten der ursprungsziele müssen bereits berechnet sein.
+
+    :param kind: korrektur-code (KORR_DURCHFAHRT, KORR_PLANHALT, KORR_EINFAHRT oder KORR_FLUEGELUNG)
+    :param arrays: zieldaten, v_ab wird in-place aktualisiert
+    :param rows: zeilennummern der zu berechnenden ziele
+    :param kontext: planungsdaten des laufenden durchgangs
+    :return: None
+    :raise: ValueError bei unbekanntem korrektur-code
+    """
+
+    if kind == KORR_DURCHFAHRT:
+        arrays.v_ab[rows] = arrays.v_an[rows]
+    elif kind == KORR_PLANHALT:
+        arrays.v_ab[rows] = np.maximum(0, arrays.d_min[rows] + arrays.p_an[rows] +
+                                       arrays.v_an[rows] - arrays.p_ab[rows])
+    elif kind == KORR_EINFAHRT:
+        arrays.v_ab[rows] = np.maximum(arrays.p_an[rows] + arrays.v_an[rows], kontext.simzeit_minuten) - arrays.p_ab[rows]
+    elif kind == KORR_FLUEGELUNG:
+        stamm = arrays.ursprung[rows]
+        arrays.v_ab[rows] = np.maximum(arrays.p_ab[stamm] + arrays.v_ab[stamm], arrays.p_ab[rows]) - arrays.p_ab[rows]
+    else:
+        raise ValueError(f"korrektur-code {kind} kann nicht vektorisiert werden")
+
+
 class JSONEncoder(json.JSONEncoder):
     """
     translate non-standard objects to JSON objects.
@@ -1228,11 +1589,16 @@ class Planung:
     zuege: erstellt einen topologisch sortierten generator von zügen (s. zugsortierung).
 
     zugbaum_ungerichtet: view auf zugbaum mit ungerichteten kanten.
+        das property erstellt den view bei jedem zugriff.
 
     zugsortierung: topologisch sortierte liste von zid.
         folgezüge kommen in dieser liste nie vor dem stammzug.
 
-    zugstamm: gibt zu jedem zid den stamm an, d.h. ein set mit allen verknüpften zid.
+    zugstamm_label: gibt zu jedem zid die nummer seines stamms an (zusammenhängende komponente im zugbaum).
+        züge mit gleichem label sind über flags miteinander verknüpft.
+
+    zugstamm: gibt zu jedem zid den stamm an, d.h. ein frozenset mit allen verknüpften zid.
+        das property wird bei bedarf aus zugstamm_label erstellt.
 
     auswertung: ...
 
@@ -1242,17 +1608,67 @@ class Planung:
     def __init__(self):
         self.zugliste: Dict[int, ZugDetailsPlanung] = dict()
         self.zugbaum = nx.DiGraph()
-        self.zugbaum_ungerichtet = nx.Graph()
+        self._zid_index: Dict[int, int] = {}
+        self._zid_liste: List[int] = []
+        self._zuege_mit_einfahrt: Set[int] = set()
+        self._zuege_mit_ausfahrt: Set[int] = set()
         self.zugsortierung: List[int] = []
-        self.zugstamm: Dict[int, Set[int]] = {}
+        self.zugstamm_label: Dict[int, int] = {}
+        self._zugstamm: Optional[Dict[int, FrozenSet[int]]] = None
+        self._zugbaum_dirty: bool = True
+        self._zid_nach_nummer: Dict[int, int] = {}
+        self._zid_nach_name: Dict[str, int] = {}
         self.zielgraph = nx.DiGraph()
-        self.zielsortierung: List[Tuple[str, int, str]] = []
-        self.zielindex_plan: Dict[Tuple[int, str], Dict[str, ZugZielPlanung]] = {}
+        self._zielgraph_dirty: bool = True
+        self.zielsortierung: List[ZugZielNode] = []
+        self._zielzeilen: Dict[ZugZielNode, int] = {}
+        self._zielgenerationen: List[int] = [0]
+        self.zielindex_plan: Dict[Tuple[int, str, str], ZugZielPlanung] = {}
         self._haengige_folgekorrekturen: Dict[ZugZielNode, Dict] = {}
         self.auswertung: Optional[Auswertung] = None
         self.simzeit_minuten: int = 0
         self.params = PlanungParams()
 
+    @property
+    def zugbaum_ungerichtet(self) -> nx.Graph:
+        """
+        ungerichteter view auf den zugbaum
+
+        :return: nx.Graph-view
+        """
+
+        return self.zugbaum.to_undirected(as_view=True)
+
+    @property
+    def zugstamm(self) -> Dict[int, FrozenSet[int]]:
+        """
+        stamm (frozenset von verknüpften zid) zu jedem zid
+
+        der dict wird beim ersten zugriff nach einer zugbaum-analyse aus zugstamm_label erstellt.
+        alle züge eines stamms teilen sich dasselbe frozenset-objekt.
+
+        :return: dict zid -> frozenset von zid
+        """
+
+        if self._zugstamm is None:
+            komponenten: Dict[int, List[int]] = collections.defaultdict(list)
+            for zid, label in self.zugstamm_label.items():
+                komponenten[label].append(zid)
+            self._zugstamm = {}
+            for zids in komponenten.values():
+                stamm = frozenset(zids)
+                self._zugstamm.update(dict.fromkeys(stamm, stamm))
+        return self._zugstamm
+
+    def kontext(self) -> PlanungKontext:
+        """
+        aktuellen planungskontext für einen berechnungsdurchgang erstellen
+
+        :return: PlanungKontext mit den aktuellen werten der planung
+        """
+
+        return PlanungKontext(simzeit_minuten=self.simzeit_minuten)
+
     def zuege(self) -> Iterable[ZugDetailsPlanung]:
         """
         topologisch sortierter generator von zuegen
@@ -1262,9 +1678,10 @@ class Planung:
         :return: iteration von ZugDetailsPlanung-objekten
         """
 
+        knoten_daten = self.zugbaum._node
         for zid in self.zugsortierung:
             try:
-                zug = self.zugbaum.nodes[zid]['obj']
+                zug = knoten_daten[zid]['obj']
                 yield zug
             except KeyError:
                 pass
@@ -1283,38 +1700,43 @@ class Planung:
         :return:
         """
 
-        ausgefahrene_zuege = set(self.zugbaum.nodes)
+        # bekannte zuege, die in der aktuellen zugliste vorkommen (index gemaess _zid_liste)
+        gesehen = np.zeros(len(self._zid_liste), dtype=bool)
 
+        knoten_daten = self.zugbaum._node
         for zug in zuege:
             try:
-                zug_planung = self.zugbaum.nodes[zug.zid]['obj']
+                zug_planung = knoten_daten[zug.zid]['obj']
             except KeyError:
                 # neuer zug
                 zug_planung = ZugDetailsPlanung()
                 zug_planung.assign_zug_details(zug)
                 zug_planung.update_zug_details(zug)
-                ausgefahrene_zuege.discard(zug.zid)
+                self._zid_index[zug.zid] = len(self._zid_liste)
+                self._zid_liste.append(zug.zid)
+                self._zugbaum_dirty = True
+                # der fahrplan wird nur bei assign_zug_details aufgebaut, die ein-/ausfahrt aendert sich danach nicht.
+                if zug_planung.fahrplan:
+                    if zug_planung.fahrplan[0].einfahrt:
+                        self._zuege_mit_einfahrt.add(zug.zid)
+                    if zug_planung.fahrplan[-1].ausfahrt:
+                        self._zuege_mit_ausfahrt.add(zug.zid)
             else:
                 # bekannter zug
                 zug_planung.update_zug_details(zug)
-                ausgefahrene_zuege.discard(zug.zid)
+                gesehen[self._zid_index[zug.zid]] = True
             self.zugbaum.add_node(zug.zid, obj=zug_planung)
 
-        for zid in ausgefahrene_zuege:
-            try:
-                zug = self.zugbaum.nodes[zid]['obj']
-            except KeyError:
-                pass
-            else:
-                if zug.sichtbar:
-                    zug.sichtbar = zug.amgleis = False
-                    zug.gleis = zug.plangleis = ""
-                    zug.ausgefahren = True
-                    for zeile in zug.fahrplan:
-                        zeile.abgefahren = zeile.abgefahren or True
+        for i in np.flatnonzero(~gesehen).tolist():
+            zug = knoten_daten[self._zid_liste[i]]['obj']
+            if zug.sichtbar:
+                zug.sichtbar = zug.amgleis = False
+                zug.gleis = zug.plangleis = ""
+                zug.ausgefahren = True
+                for zeile in zug.fahrplan:
+                    zeile.abgefahren = zeile.abgefahren or True
 
         self._zielgraph_erstellen()
-        self._folgezuege_aufloesen()
         self._zugbaum_analysieren()
         self.korrekturen_definieren()
 
@@ -1322,12 +1744,15 @@ class Planung:
         """
         aktualisiert von zugbaum abgeleitete objekte
 
-        - zugbaum_ungerichtet
         - zugsortierung
         - zugstamm
         - zugliste
+        - suchindex von zug_finden
+        - folgezüge: ersatzzug/kuppelzug/fluegelzug-attribute der fahrplanziele
 
         muss jedesmal ausgeführt werden, wenn die zusammensetzung von self.zugbaum verändert wurde.
+        die methode kehrt sofort zurück, wenn der zugbaum seit der letzten analyse nicht verändert wurde.
+        methoden, die knoten oder kanten zum zugbaum hinzufügen, müssen deshalb _zugbaum_dirty setzen.
 
         für die analyse muss der zugbaum inklusive folgezug-verbindungen komplett sein.
         hierzu sollte die _zielgraph_erstellen-methode verwendet werden.
@@ -1335,58 +1760,67 @@ class Planung:
         :return: None
         """
 
+        if not self._zugbaum_dirty:
+            return
+
         # der zugbaum kann zyklen enthalten, z.b. wenn ein zug fluegelt und spaeter wieder kuppelt.
         # damit die topologische sortierung trotzdem funktioniert, brechen wir die zyklen zuerst auf.
         # der gefluegelte zug wird nach dem stammzug sortiert.
 
-        zb = self.zugbaum.copy()
-        edges_to_remove = []
-        for cycle in nx.simple_cycles(zb):
+        # die kuppelkanten werden nur in einem view ausgeblendet, der zugbaum wird nicht kopiert.
+        kuppelkanten = set()
+        for cycle in nx.simple_cycles(self.zugbaum):
             for edge in zip(cycle, cycle[1:] + cycle[0:1]):
-                if zb.edges[edge]['flag'] == 'K':
-                    edges_to_remove.append(edge)
-        zb.remove_edges_from(edges_to_remove)
+                if self.zugbaum.edges[edge]['flag'] == 'K':
+                    kuppelkanten.add(edge)
 
         try:
+            zb = nx.restricted_view(self.zugbaum, [], kuppelkanten)
             self.zugsortierung = list(nx.topological_sort(zb))
         except nx.NetworkXUnfeasible as e:
             logger.exception(e)
             self.zugsortierung = []
 
-        self.zugbaum_ungerichtet = self.zugbaum.to_undirected(as_view=True)
-        for stamm in nx.connected_components(self.zugbaum_ungerichtet):
-            for zid in stamm:
-                self.zugstamm[zid] = stamm
-
         self.zugliste = {zid: obj for zid, obj in self.zugbaum.nodes(data='obj') if obj is not None}
 
-    def _folgezuege_aufloesen(self):
-        """
-        folgezüge aus den zugflags auflösen.
-
-        setzt die ersatzzug/kuppelzug/fluegelzug-attribute gemäss verbindungsangaben im zugbaum.
-        die verbindungsangaben werden von _zielgraph_erstellen gesetzt.
+        # zusammenhaengende komponenten mit union-find ueber die kanten bestimmen.
+        # im gleichen durchgang werden die folgezuege gemaess den verbindungsangaben im zugbaum aufgeloest.
+        eltern = {zid: zid for zid in self.zugbaum}
 
-        :return: None
-        """
+        def wurzel(zid: int) -> int:
+            while (eltern_zid := eltern[zid]) != zid:
+                eltern[zid] = eltern[eltern_zid]
+                zid = eltern_zid
+            return zid
 
         for zid1, zid2, d in self.zugbaum.edges(data=True):
-            try:
-                zug1: ZugDetailsPlanung = self.zugbaum.nodes[zid1]['obj']
-                ziel1: ZugZielPlanung = zug1.find_fahrplan_zielnr(d['zielnr'])
-            except KeyError:
+            wurzel1 = wurzel(zid1)
+            wurzel2 = wurzel(zid2)
+            if wurzel1 != wurzel2:
+                eltern[wurzel2] = wurzel1
+
+            zug1 = self.zugliste.get(zid1)
+            if zug1 is None:
+                continue
+            ziel1 = zug1._zielnr_index.get(d['zielnr'])
+            if ziel1 is None:
                 continue
             try:
-                zug2: Optional[ZugDetailsPlanung] = self.zugbaum.nodes[zid2]['obj']
+                setattr(ziel1, FOLGEZUG_ATTRIBUTE[d['flag']], self.zugliste.get(zid2))
             except KeyError:
-                zug2 = None
+                pass
 
-            if d['flag'] == 'E':
-                ziel1.ersatzzug = zug2
-            elif d['flag'] == 'K':
-                ziel1.kuppelzug = zug2
-            elif d['flag'] == 'F':
-                ziel1.fluegelzug = zug2
+        self.zugstamm_label = {zid: wurzel(zid) for zid in eltern}
+        self._zugstamm = None
+
+        # suchindex fuer zug_finden, bei mehrdeutigkeit gilt der erste zug in der sortierung
+        self._zid_nach_nummer = {}
+        self._zid_nach_name = {}
+        for zug in self.zuege():
+            self._zid_nach_nummer.setdefault(zug.nummer, zug.zid)
+            self._zid_nach_name.setdefault(zug.name, zug.zid)
+
+        self._zugbaum_dirty = False
 
     def _zielgraph_erstellen(self):
         """
@@ -1445,6 +1879,9 @@ class Planung:
 
             ziel1 = None
             zzid1 = None
+            # neue knoten und kanten werden pro zug gesammelt und am schluss gesamthaft eingefuegt
+            neue_knoten = []
+            neue_kanten = []
 
             for ziel2 in zug.fahrplan:
                 zzid2 = ZugZielNode.neu(ziel2)
@@ -1457,27 +1894,24 @@ class Planung:
                     pass
 
                 data = zzid2.init_zieldata(ziel2)
-                self.zielgraph.add_node(zzid2, **data)
+                neue_knoten.append((zzid2, data))
 
-                d = weakref.WeakValueDictionary({zzid2[0]: ziel2})
-                try:
-                    self.zielindex_plan[(zid2, ziel2.plan)].update(d)
-                except KeyError:
-                    self.zielindex_plan[(zid2, ziel2.plan)] = d
+                self.zielindex_plan[(zid2, ziel2.plan, data['typ'])] = ziel2
 
                 if ziel1:
                     if zzid1 == zzid2:
                         logger.warning("P edge", zzid1, zzid2)
                     else:
-                        self.zielgraph.add_edge(zzid1, zzid2, typ='P')
+                        neue_kanten.append((zzid1, zzid2, {'typ': 'P'}))
 
                 if zid := ziel2.ersatz_zid():
                     zzid = ZugZielNode.neu(ziel2, zid=zid, zielnr=0)
                     if zzid2 == zzid:
                         logger.warning("E edge", zzid2, zzid)
                     else:
-                        self.zielgraph.add_edge(zzid2, zzid, typ='E')
+                        neue_kanten.append((zzid2, zzid, {'typ': 'E'}))
                         self.zugbaum.add_edge(zid2, zid, flag='E', zielnr=ziel2.zielnr)
+                        self._zugbaum_dirty = True
                 if zid := ziel2.kuppel_zid():
                     try:
                         zug: ZugDetailsPlanung = self.zugbaum.nodes[zid]['obj']
@@ -1490,24 +1924,70 @@ class Planung:
                         if zzid2 == zzid:
                             logger.warning("K edge", zzid2, zzid)
                         else:
-                            self.zielgraph.add_edge(zzid2, zzid, typ='K')
+                            neue_kanten.append((zzid2, zzid, {'typ': 'K'}))
                             self.zugbaum.add_edge(zid2, zid, flag='K', zielnr=ziel2.zielnr)
+                            self._zugbaum_dirty = True
                 if zid := ziel2.fluegel_zid():
                     zzid = ZugZielNode.neu(ziel2, zid=zid, zielnr=0)
                     if zzid2 == zzid:
                         logger.warning("F edge", zzid2, zzid)
                     else:
-                        self.zielgraph.add_edge(zzid2, zzid, typ='F')
+                        neue_kanten.append((zzid2, zzid, {'typ': 'F'}))
                         self.zugbaum.add_edge(zid2, zid, flag='F', zielnr=ziel2.zielnr)
+                        self._zugbaum_dirty = True
 
                 ziel1 = ziel2
                 zzid1 = zzid2
 
-        self._zielgraph_sortieren()
+            if neue_knoten:
+                self.zielgraph.add_nodes_from(neue_knoten)
+                self.zielgraph.add_edges_from(neue_kanten)
+                self._zielgraph_dirty = True
+
+        if self._zielgraph_dirty:
+            self._zielgraph_sortieren()
 
     def _zielgraph_sortieren(self):
+        """
+        topologische sortierung des zielgraphen
+
+        die sortierung erfolgt nach generationen:
+        die ziele einer generation hängen nur von zielen früherer generationen ab.
+        _zielgenerationen enthält die offsets der generationen in zielsortierung.
+        _zielzeilen enthält die position jedes knotens in zielsortierung.
+
+        der zielgraph wird dazu in eine CSR-darstellung (indptr, indices) übertragen
+        und mit csr_topologisch_sortieren sortiert.
+
+        _zielgraph_erstellen sortiert nur, wenn _zielgraph_dirty gesetzt ist.
+        methoden, die knoten oder kanten zum zielgraph hinzufügen, müssen das flag deshalb setzen.
+
+        :return: None
+        :raise: nx.NetworkXUnfeasible, wenn der zielgraph zyklen enthält.
+        """
+
+        knoten = list(self.zielgraph)
+        knoten_ids = {node: i for i, node in enumerate(knoten)}
+        n_kanten = self.zielgraph.number_of_edges()
+        quellen = np.empty(n_kanten, dtype=np.intp)
+        ziele = np.empty(n_kanten, dtype=np.intp)
+        # die kanten werden nach quellknoten geordnet erfasst, so dass ziele direkt als indices dienen kann
+        k = 0
+        for node, nachfolger in self.zielgraph._succ.items():
+            i = knoten_ids[node]
+            for folge in nachfolger:
+                quellen[k] = i
+                ziele[k] = knoten_ids[folge]
+                k += 1
+        indptr = np.zeros(len(knoten) + 1, dtype=np.intp)
+        np.cumsum(np.bincount(quellen, minlength=len(knoten)), out=indptr[1:])
+
         try:
-            self.zielsortierung = list(nx.topological_sort(self.zielgraph))
+            sortierung, grenzen = csr_topologisch_sortieren(indptr, ziele)
+            self.zielsortierung = [knoten[i] for i in sortierung.tolist()]
+            self._zielzeilen = {node: row for row, node in enumerate(self.zielsortierung)}
+            self._zielgenerationen = grenzen
+            self._zielgraph_dirty = False
         except nx.NetworkXUnfeasible as e:
             logger.error("fehler beim sortieren des zielgraphen")
             logger.exception(e)
@@ -1536,38 +2016,63 @@ class Planung:
 
         analog wird die ausfahrtszeit im letzten fahrplaneintrag abgeschätzt.
 
+        es werden nur die züge betrachtet, die gemäss _zuege_mit_einfahrt und _zuege_mit_ausfahrt
+        eine ein- oder ausfahrt im fahrplan haben.
+        die reihenfolge spielt keine rolle, da jeder zug nur seinen eigenen fahrplan verändert.
+
+        gerechnet wird mit den zwischengespeicherten planzeiten in minuten (an_minute_plan, ab_minute_plan),
+        die fahrzeit wird von sekunden in minuten umgerechnet.
+
+        die fahrzeitschätzungen werden während eines aufrufs pro (zugname, start, ziel) zwischengespeichert.
+        der cache wird nicht über den aufruf hinaus behalten, da die auswertung laufend neue fahrzeiten lernt.
+
         :return:
         """
 
-        for zug in self.zuege():
+        fahrzeiten: Dict[Tuple[str, str, str], float] = {}
+
+        def fahrzeit_schaetzen(name: str, start: str, ziel: str) -> float:
+            schluessel = (name, start, ziel)
+            try:
+                return fahrzeiten[schluessel]
+            except KeyError:
+                fahrzeit = fahrzeiten[schluessel] = self.auswertung.fahrzeit_schaetzen(name, start, ziel)
+                return fahrzeit
+
+        zugliste = self.zugliste
+        for zid in self._zuege_mit_einfahrt:
             try:
+                zug = zugliste[zid]
                 einfahrt = zug.fahrplan[0]
                 ziel1 = zug.fahrplan[1]
-            except IndexError:
+            except (KeyError, IndexError):
                 pass
             else:
-                if einfahrt.einfahrt and einfahrt.variable_zeit and einfahrt.gleis and ziel1.gleis:
-                    fahrzeit = self.auswertung.fahrzeit_schaetzen(zug.name, einfahrt.gleis, ziel1.gleis)
+                if einfahrt.einfahrt and einfahrt.variable_zeit and einfahrt.gleis and ziel1.gleis \
+                        and ziel1.an_minute_plan is not None:
+                    fahrzeit = fahrzeit_schaetzen(zug.name, einfahrt.gleis, ziel1.gleis)
                     if not np.isnan(fahrzeit):
                         try:
-                            einfahrt.an = einfahrt.ab = seconds_to_time(time_to_seconds(ziel1.an) - fahrzeit)
+                            einfahrt.an = einfahrt.ab = minutes_to_time(ziel1.an_minute_plan - fahrzeit / 60)
                             logger.debug(f"einfahrt {einfahrt.gleis} - {ziel1.gleis} korrigiert: {einfahrt.ab}")
-                        except (AttributeError, ValueError):
+                        except ValueError:
                             pass
 
+        for zid in self._zuege_mit_ausfahrt:
             try:
+                zug = zugliste[zid]
                 ziel2 = zug.fahrplan[-2]
                 ausfahrt = zug.fahrplan[-1]
-            except IndexError:
+            except (KeyError, IndexError):
                 pass
             else:
-                if ausfahrt.ausfahrt and ausfahrt.variable_zeit:
-                    fahrzeit = self.auswertung.fahrzeit_schaetzen(zug.name, ziel2.gleis, ausfahrt.gleis)
+                if ausfahrt.ausfahrt and ausfahrt.variable_zeit and ziel2.ab_minute_plan is not None:
+                    fahrzeit = fahrzeit_schaetzen(zug.name, ziel2.gleis, ausfahrt.gleis)
                     if not np.isnan(fahrzeit):
                         try:
-                            ausfahrt.an = ausfahrt.ab = seconds_to_time(time_to_seconds(ziel2.ab) + fahrzeit)
+                            ausfahrt.an = ausfahrt.ab = minutes_to_time(ziel2.ab_minute_plan + fahrzeit / 60)
                             logger.debug(f"ausfahrt {ziel2.gleis} - {ausfahrt.gleis} korrigiert: {ausfahrt.an}")
-                        except (AttributeError, ValueError):
+                        except ValueError:
                             pass
 
     def verspaetungen_korrigieren(self):
@@ -1577,94 +2082,329 @@ class Planung:
         :return: None
         """
 
+        knoten_daten = self.zielgraph._node
         for node in self.zielsortierung:
-            data = self.zielgraph.nodes[node]
+            data = knoten_daten[node]
             try:
                 ziel: ZugZielPlanung = data['obj']
             except KeyError:
                 # zug hat keinen fahrplan
                 continue
-            zug: ZugDetailsPlanung = ziel.zug
+            self._zieldaten_initialisieren(data, ziel)
 
-            if not ziel.angekommen:
-                # beim aktuellen ziel verspaetung von zug uebernehmen
-                if ziel.einfahrt or (zug.sichtbar and zug.plangleis == ziel.plan):
-                    data['v_an'] = zug.verspaetung
-                else:
-                    data['v_an'] = 0
+        arrays = self._materialize_plan_arrays()
+        self._verspaetungen_propagieren(arrays)
 
-                # graph-daten aktualisieren
-                try:
-                    data['p_an'] = time_to_minutes(ziel.an)
-                    data['p_ab'] = time_to_minutes(ziel.ab)
-                except AttributeError:
-                    pass
-                data['d_min'] = ziel.mindestaufenthalt
-                data['v_ab'] = data['v_an']
-            else:
-                data['v_an'] = ziel.verspaetung_an
-                data['v_ab'] = ziel.verspaetung_ab
+    @staticmethod
+    def _zieldaten_initialisieren(data: Dict[str, Any], ziel: ZugZielPlanung):
+        """
+        knotendaten eines ziels für die verspätungsberechnung aus dem zielobjekt initialisieren
 
-        for node in self.zielsortierung:
-            data = self.zielgraph.nodes[node]
-            try:
-                ziel: ZugZielPlanung = data['obj']
-                if data['p_an'] is None or data['p_ab'] is None:
+        :param data: knotendaten des ziels im zielgraph
+        :param ziel: zielobjekt
+        :return: None
+        """
+
+        zug: ZugDetailsPlanung = ziel.zug
+
+        if not ziel.angekommen:
+            # beim aktuellen ziel verspaetung von zug uebernehmen
+            if ziel.einfahrt or (zug.sichtbar and zug.plangleis == ziel.plan):
+                data['v_an'] = zug.verspaetung
+            else:
+                data['v_an'] = 0
+
+            # graph-daten aktualisieren
+            if ziel.an_minute_plan is not None:
+                data['p_an'] = ziel.an_minute_plan
+                if ziel.ab_minute_plan is not None:
+                    data['p_ab'] = ziel.ab_minute_plan
+            data['d_min'] = ziel.mindestaufenthalt
+            data['v_ab'] = data['v_an']
+        else:
+            data['v_an'] = ziel.verspaetung_an
+            data['v_ab'] = ziel.verspaetung_ab
+
+    def _materialize_plan_arrays(self) -> PlanArrays:
+        """
+        zieldaten in spaltenform übertragen
+
+        die methode geht die zielsortierung einmal durch und überträgt die knotendaten des zielgraphen
+        in parallele arrays (s. PlanArrays).
+        ziele ohne fdl-korrektur, deren auto-korrektur einen vektorisierbaren korrektur-code (KIND) hat,
+        werden für die vektorisierte berechnung markiert.
+
+        die knotendaten müssen vorher initialisiert sein (erste schleife von verspaetungen_korrigieren).
+
+        :return: PlanArrays
+        """
+
+        graph = self.zielgraph
+        n = len(self.zielsortierung)
+        knoten_daten = graph._node
+        daten = [knoten_daten[node] for node in self.zielsortierung]
+        objekte = np.fromiter((data.get('obj') for data in daten), dtype=object, count=n)
+
+        # spalten in einem durchgang uebertragen, fehlende zeitangaben werden mit MINUTEN_FEHLT markiert
+        p_an = spalte_minuten(daten, 'p_an')
+        p_ab = spalte_minuten(daten, 'p_ab')
+        d_min = np.fromiter((data.get('d_min', 0) for data in daten), dtype=np.int32, count=n)
+        v_an = np.fromiter((data.get('v_an', 0) for data in daten), dtype=np.int32, count=n)
+        v_ab = np.fromiter((data.get('v_ab', 0) for data in daten), dtype=np.int32, count=n)
+        angekommen = np.fromiter((ziel is None or bool(ziel.angekommen) for ziel in objekte), dtype=bool, count=n)
+        abgefahren = np.fromiter((ziel is None or bool(ziel.abgefahren) for ziel in objekte), dtype=bool, count=n)
+        berechnen = ((p_an != MINUTEN_FEHLT) & (p_ab != MINUTEN_FEHLT)).tolist()
+
+        index = {}
+        korr_kind = [KORR_UEBERSPRINGEN] * n
+        ursprung = [-1] * n
+        kanten_ziel = []
+        kanten_quelle = []
+        kanten_typ = []
+        kanten_grenzen = [0]
+        python_ziele = []
+
+        grenzen = self._zielgenerationen
+        for start, stop in zip(grenzen[:-1], grenzen[1:]):
+            for row in range(start, stop):
+                ziel: ZugZielPlanung = objekte[row]
+                if ziel is None:
+                    continue
+                node = self.zielsortierung[row]
+                index[node] = row
+                if not berechnen[row]:
                     continue
-            except KeyError:
-                continue
 
-            if not ziel.angekommen:
-                if ziel.auto_korrektur is not None:
-                    try:
-                        ziel.auto_korrektur.ankunft_berechnen(self.zielgraph, node, data)
-                    except KeyError as e:
-                        logger.exception(e)
+                if ziel.fdl_korrektur or ziel.auto_korrektur is None:
+                    kind = KORR_PYTHON
                 else:
-                    logger.warning(f"keine autokorrektur fuer ziel {ziel}")
+                    kind = ziel.auto_korrektur.KIND
+
+                ursprung_row = -1
+                if kind == KORR_FLUEGELUNG:
+                    ursprung_row = index.get(ziel.auto_korrektur.ursprung, -1)
+                    if not 0 <= ursprung_row < start or korr_kind[ursprung_row] == KORR_UEBERSPRINGEN:
+                        kind = KORR_PYTHON
+                        ursprung_row = -1
+
+                if kind not in {KORR_PYTHON, KORR_EINFAHRT}:
+                    # die einfahrt übernimmt keine ankunftsverspätung
+                    kanten = []
+                    for pred, edge_data in graph._pred[node].items():
+                        try:
+                            quelle = index[pred]
+                            kante = KANTEN_KIND[edge_data['typ']]
+                        except KeyError:
+                            continue
+                        if kante != KANTEN_KIND['P'] and korr_kind[quelle] == KORR_UEBERSPRINGEN:
+                            # vorgaenger ohne zeitangaben: spezialfall den korrekturobjekten ueberlassen
+                            kind = KORR_PYTHON
+                            ursprung_row = -1
+                            break
+                        kanten.append((quelle, kante))
+                    else:
+                        for quelle, kante in kanten:
+                            kanten_ziel.append(row)
+                            kanten_quelle.append(quelle)
+                            kanten_typ.append(kante)
+
+                korr_kind[row] = kind
+                ursprung[row] = ursprung_row
+                if kind == KORR_PYTHON:
+                    python_ziele.append((row, node))
+
+            kanten_grenzen.append(len(kanten_ziel))
+
+        # vorgaenger der einzeln berechneten ziele, damit sie nach der berechnung nachgeladen werden koennen
+        vorgaenger = {row: tuple(index[pred] for pred in graph._pred[node] if pred in index)
+                      for row, node in python_ziele}
+
+        return PlanArrays(objekte=objekte,
+                          daten=daten,
+                          index=index,
+                          korr_kind=np.array(korr_kind, dtype=np.int8),
+                          p_an=p_an,
+                          p_ab=p_ab,
+                          d_min=d_min,
+                          v_an=v_an,
+                          v_ab=v_ab,
+                          angekommen=angekommen,
+                          abgefahren=abgefahren,
+                          ursprung=np.array(ursprung, dtype=np.intp),
+                          kanten_ziel=np.array(kanten_ziel, dtype=np.intp),
+                          kanten_quelle=np.array(kanten_quelle, dtype=np.intp),
+                          kanten_typ=np.array(kanten_typ, dtype=np.int8),
+                          kanten_grenzen=kanten_grenzen,
+                          vorgaenger=vorgaenger)
+
+    def _verspaetungen_propagieren(self, arrays: PlanArrays):
+        """
+        verspätungen generationenweise durch den zielgraphen fortpflanzen
+
+        die ziele einer generation sind voneinander unabhängig.
+        die vektorisierbaren ziele einer generation werden mit numpy-operationen über die ganze generation berechnet,
+        wobei die berechnungsart mit dem korrektur-code ausgewählt wird.
+        die übrigen ziele werden einzeln von ihren korrekturobjekten berechnet.
+        die resultate werden nach jeder generation in die knotendaten und zielobjekte zurückgeschrieben,
+        damit die korrekturobjekte der folgenden generationen darauf zugreifen können.
+
+        :param arrays: von _materialize_plan_arrays erstellte zieldaten
+        :return: None
+        """
 
-                for korr in ziel.fdl_korrektur.values():
-                    try:
-                        korr.ankunft_berechnen(self.zielgraph, node, data)
-                    except KeyError as e:
-                        logger.exception(e)
+        kontext = self.kontext()
+        ankunft = np.zeros(len(arrays.korr_kind), dtype=np.int32)
+        hat_vorgaenger = np.zeros(len(arrays.korr_kind), dtype=bool)
+
+        grenzen = self._zielgenerationen
+        for generation, (start, stop) in enumerate(zip(grenzen[:-1], grenzen[1:])):
+            kind = arrays.korr_kind[start:stop]
+            rows = np.flatnonzero(kind > KORR_PYTHON) + start
+
+            if len(rows):
+                k0 = arrays.kanten_grenzen[generation]
+                k1 = arrays.kanten_grenzen[generation + 1]
+                ziele = arrays.kanten_ziel[k0:k1]
+                quellen = arrays.kanten_quelle[k0:k1]
+                kante = arrays.kanten_typ[k0:k1]
+                # P: gleiche verspaetung wie vorgaenger, E: abfahrt des vorgaengers, F: ankunft des vorgaengers
+                werte = np.where(kante == KANTEN_KIND['P'], arrays.p_an[ziele] + arrays.v_ab[quellen],
+                                 np.where(kante == KANTEN_KIND['E'], arrays.p_ab[quellen] + arrays.v_ab[quellen],
+                                          arrays.p_an[quellen] + arrays.v_an[quellen]))
+                if len(ziele):
+                    # die kanten sind nach ziel geordnet: maximum pro zusammenhaengendem segment
+                    segmente = np.flatnonzero(np.concatenate(([True], ziele[1:] != ziele[:-1])))
+                    segment_ziele = ziele[segmente]
+                    ankunft[segment_ziele] = np.maximum(np.maximum.reduceat(werte, segmente), 0)
+                    hat_vorgaenger[segment_ziele] = True
+
+                an_rows = rows[hat_vorgaenger[rows] & ~arrays.angekommen[rows]]
+                arrays.v_an[an_rows] = ankunft[an_rows] - arrays.p_an[an_rows]
+
+                ab_rows = rows[~arrays.abgefahren[rows]]
+                ab_kind = arrays.korr_kind[ab_rows]
+                for korr_kind in np.unique(ab_kind).tolist():
+                    abfahrt_vektoriell(korr_kind, arrays, ab_rows[ab_kind == korr_kind], kontext)
+
+                for row, v_an, v_ab in zip(rows.tolist(), arrays.v_an[rows].tolist(), arrays.v_ab[rows].tolist()):
+                    data = arrays.daten[row]
+                    data['v_an'] = v_an
+                    data['v_ab'] = v_ab
+                    ziel = arrays.objekte[row]
+                    if not ziel.angekommen:
+                        ziel.verspaetung_an = v_an
+                    if not ziel.abgefahren:
+                        ziel.verspaetung_ab = v_ab
+
+            for row in (np.flatnonzero(kind == KORR_PYTHON) + start).tolist():
+                node = self.zielsortierung[row]
+                data = arrays.daten[row]
+                self._ziel_verspaetung_berechnen(node, data, arrays.objekte[row], kontext)
+                arrays.v_an[row] = data['v_an']
+                arrays.v_ab[row] = data['v_ab']
+
+                # korrekturen duerfen die daten von verknuepften zielen aendern (z.b. kupplung)
+                for quelle in arrays.vorgaenger[row]:
+                    arrays.v_an[quelle] = arrays.daten[quelle]['v_an']
+                    arrays.v_ab[quelle] = arrays.daten[quelle]['v_ab']
+
+    def _ziel_verspaetung_berechnen(self, node: ZugZielNode, data: Dict[str, Any], ziel: ZugZielPlanung,
+                                    kontext: PlanungKontext):
+        """
+        verspätung eines einzelnen ziels mittels korrekturobjekten berechnen
+
+        :param node: schlüssel des ziels im zielgraph
+        :param data: knotendaten des ziels
+        :param ziel: zielobjekt
+        :param kontext: planungsdaten des laufenden durchgangs
+        :return: None
+        """
 
-                ziel.verspaetung_an = data['v_an']
+        if not ziel.angekommen:
+            if ziel.auto_korrektur is not None:
+                try:
+                    ziel.auto_korrektur.ankunft_berechnen(self.zielgraph, node, data, kontext)
+                except KeyError as e:
+                    logger.exception(e)
+            else:
+                logger.warning(f"keine autokorrektur fuer ziel {ziel}")
 
-            # bei noch nicht abgefahrenen zielen verspaetung korrigieren
-            if not ziel.abgefahren:
-                if ziel.auto_korrektur is not None:
-                    try:
-                        ziel.auto_korrektur.abfahrt_berechnen(self.zielgraph, node, data)
-                    except KeyError as e:
-                        logger.exception(e)
-                else:
-                    data['v_ab'] = data['v_an']
+            for korr in ziel.fdl_korrektur.values():
+                try:
+                    korr.ankunft_berechnen(self.zielgraph, node, data, kontext)
+                except KeyError as e:
+                    logger.exception(e)
 
-                for korr in ziel.fdl_korrektur.values():
-                    try:
-                        korr.abfahrt_berechnen(self.zielgraph, node, data)
-                    except KeyError as e:
-                        logger.exception(e)
+            ziel.verspaetung_an = data['v_an']
+
+        # bei noch nicht abgefahrenen zielen verspaetung korrigieren
+        if not ziel.abgefahren:
+            if ziel.auto_korrektur is not None:
+                try:
+                    ziel.auto_korrektur.abfahrt_berechnen(self.zielgraph, node, data, kontext)
+                except KeyError as e:
+                    logger.exception(e)
+            else:
+                data['v_ab'] = data['v_an']
+
+            for korr in ziel.fdl_korrektur.values():
+                try:
+                    korr.abfahrt_berechnen(self.zielgraph, node, data, kontext)
+                except KeyError as e:
+                    logger.exception(e)
 
-                ziel.verspaetung_ab = data['v_ab']
+            ziel.verspaetung_ab = data['v_ab']
 
     def zugverspaetung_korrigieren(self, zug: ZugDetailsPlanung):
         """
         verspätungsangaben einer zugfamilie nachführen
 
-        diese methode führt die verspätungsangaben des angegebenen zugs und der verknüpften züge nach.
+        diese methode führt die verspätungsangaben des angegebenen zugs und der verknüpften züge (zugstamm) nach,
+        sowie aller ziele, die im zielgraph davon abhängen (z.b. über anschlüsse).
+        die übrigen ziele werden nicht neu berechnet,
+        ihre knotendaten müssen vom letzten durchgang von verspaetungen_korrigieren aktuell sein.
+        die methode ist für einzelne änderungen gedacht, z.b. nach einer fdl-korrektur.
 
-        aktuell ist die methode nicht implementiert und ruft verspaetungen_korrigieren auf,
-        die alle züge nachführt.
-        es ist fraglich, ob es effizienter ist, die zugfamilien einzeln zu korrigieren,
-        da die bestimmung der familien auch einen aufwand bedeutet.
+        die betroffenen ziele werden in der reihenfolge der zielsortierung einzeln von ihren korrekturobjekten berechnet.
+        wenn die zielsortierung nicht aktuell ist, werden alle züge nachgeführt.
 
-        :param zug:
-        :return:
+        :param zug: zug, dessen verspätung geändert wurde
+        :return: None
         """
 
-        self.verspaetungen_korrigieren()
+        if self._zielgraph_dirty:
+            self.verspaetungen_korrigieren()
+            return
+
+        stamm = self.zugstamm.get(zug.zid) or {zug.zid}
+        stapel = [ZugZielNode.neu(ziel) for zid in stamm if (z := self.zugliste.get(zid)) is not None
+                  for ziel in z.fahrplan]
+        nachfolger = self.zielgraph._succ
+        betroffen = set()
+        while stapel:
+            node = stapel.pop()
+            if node not in betroffen and node in nachfolger:
+                betroffen.add(node)
+                stapel.extend(nachfolger[node])
+
+        try:
+            reihenfolge = sorted(betroffen, key=self._zielzeilen.__getitem__)
+        except KeyError:
+            self.verspaetungen_korrigieren()
+            return
+
+        knoten_daten = self.zielgraph._node
+        kontext = self.kontext()
+        for node in reihenfolge:
+            data = knoten_daten[node]
+            try:
+                ziel: ZugZielPlanung = data['obj']
+            except KeyError:
+                continue
+            self._zieldaten_initialisieren(data, ziel)
+            if data.get('p_an') is None or data.get('p_ab') is None:
+                continue
+            self._ziel_verspaetung_berechnen(node, data, ziel, kontext)
 
     def korrekturen_definieren(self):
         for zug in self.zuege():
@@ -1764,14 +2504,21 @@ class Planung:
                                                            "folge_korrektur": folge_korrektur}
         else:
             typ = stamm_ziel.auto_korrektur.edge_typ
+            if not self.zielgraph.has_edge(stamm_zzid, zzid2):
+                # die sortierung hängt nur von der struktur ab, eine bestehende kante ändert sie nicht
+                self._zielgraph_dirty = True
             self.zielgraph.add_edge(stamm_zzid, zzid2, typ=typ)
             stamm_ziel.auto_korrektur.folge = zzid2
             folge_korrektur.ursprung = stamm_zzid
             if ziel2.auto_korrektur is None or folge_korrektur.rang > ziel2.auto_korrektur.rang:
                 ziel2.auto_korrektur = folge_korrektur
             if typ in {'E', 'K'}:
-                an1 = minutes_to_time(time_to_minutes(stamm_ziel.an) + stamm_ziel.mindestaufenthalt)
-                stamm_ziel.ab = max(ziel2.an, an1)
+                # in minuten vergleichen, das time-objekt wird nur bei einer änderung erzeugt
+                an1 = stamm_ziel.an_minute_plan + stamm_ziel.mindestaufenthalt
+                if an1 > ziel2.an_minute_plan:
+                    stamm_ziel.ab = minutes_to_time(an1)
+                else:
+                    stamm_ziel.ab = ziel2.an
             try:
                 del self._haengige_folgekorrekturen[stamm_zzid]
             except KeyError:
@@ -1799,19 +2546,14 @@ class Planung:
             None, wenn kein passendes objekt gefunden wurde.
         """
 
-        zid = None
         try:
             zid = zug.zid
         except AttributeError:
-            for z in self.zuege():
-                if z.nummer == zug or z.name == zug:
-                    zid = z.zid
-                    break
+            zid = self._zid_nach_nummer.get(zug)
+            if zid is None:
+                zid = self._zid_nach_name.get(zug)
 
-        try:
-            return self.zugbaum[zid]['obj']
-        except KeyError:
-            return None
+        return self.zugliste.get(zid)
 
     def fdl_korrektur_setzen(self, korrektur: VerspaetungsKorrektur, ziel: Union[ZugZielPlanung, ZugZielNode]):
         """
@@ -1929,11 +2671,14 @@ class Planung:
             return None
 
         try:
-            zug = self.zugbaum.nodes[ereignis.zid]['obj']
+            zug = self.zugbaum._node[ereignis.zid]['obj']
         except KeyError:
             logger.warning(f"zug von ereignis {ereignis} nicht in zugliste")
             return None
 
+        # die plan-zeiten der ziele sind bereits in minuten zwischengespeichert (an_minute_plan, ab_minute_plan)
+        ereignis_minute = time_to_minutes(ereignis.zeit) if ereignis.zeit is not None else None
+
         try:
             alter_index = zug.ziel_index
             altes_ziel = zug.fahrplan[zug.ziel_index]
@@ -1962,7 +2707,8 @@ class Planung:
                 pass
             else:
                 if einfahrt.einfahrt:
-                    einfahrt.verspaetung_ab = time_to_minutes(ereignis.zeit) - time_to_minutes(einfahrt.ab)
+                    if ereignis_minute is not None and einfahrt.ab_minute_plan is not None:
+                        einfahrt.verspaetung_ab = ereignis_minute - einfahrt.ab_minute_plan
                     einfahrt.angekommen = einfahrt.abgefahren = ereignis.zeit
 
         elif ereignis.art == 'ausfahrt':
@@ -1982,9 +2728,9 @@ class Planung:
 
         elif ereignis.art == 'ankunft':
             if not altes_ziel.angekommen:
-                try:
-                    altes_ziel.verspaetung_an = time_to_minutes(ereignis.zeit) - time_to_minutes(altes_ziel.an)
-                except AttributeError:
+                if ereignis_minute is not None and altes_ziel.an_minute_plan is not None:
+                    altes_ziel.verspaetung_an = ereignis_minute - altes_ziel.an_minute_plan
+                else:
                     altes_ziel.verspaetung_an = ereignis.verspaetung
                 altes_ziel.angekommen = ereignis.zeit
 
@@ -1994,7 +2740,7 @@ class Planung:
                     altes_ziel.abgefahren = ereignis.zeit
 
                 # falls ein ereignis vergessen gegangen ist:
-                for ziel in zug.fahrplan[0:alter_index]:
+                for ziel in zug.fahrplan_bis(alter_index):
                     ziel.angekommen = ziel.angekommen or True
                     ziel.abgefahren = ziel.abgefahren or True
 
@@ -2004,10 +2750,8 @@ class Planung:
                     altes_ziel.auto_korrektur = Signalhalt(self)
                     altes_ziel.auto_korrektur.verspaetung = ereignis.verspaetung
             elif not altes_ziel.abgefahren:
-                try:
-                    altes_ziel.verspaetung_ab = time_to_minutes(ereignis.zeit) - time_to_minutes(altes_ziel.ab)
-                except AttributeError:
-                    pass
+                if ereignis_minute is not None and altes_ziel.ab_minute_plan is not None:
+                    altes_ziel.verspaetung_ab = ereignis_minute - altes_ziel.ab_minute_plan
                 altes_ziel.abgefahren = ereignis.zeit
 
         elif ereignis.art == 'rothalt' or ereignis.art == 'wurdegruen':
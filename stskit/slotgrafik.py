@@ -9,6 +9,7 @@ from dataclasses import dataclass, field
 import functools
 import itertools
 import logging
+import operator
 import re
 from typing import Any, Dict, Generator, Iterable, List, Mapping, Optional, Set, Tuple, Union
 
@@ -25,9 +26,16 @@ logger = logging.getLogger(__name__)
 logger.addHandler(logging.NullHandler())
 
 
+# vorformatierte beschriftungen für zwei tage, damit auch achsen über mitternacht abgedeckt sind
+_HOUR_MINUTES = tuple(f"{m // 60:02}:{m % 60:02}" for m in range(2 * 24 * 60))
+
+
 def hour_minutes_formatter(x: Union[int, float], pos: Any) -> str:
     # return "{0:02}:{1:02}".format(int(x) // 60, int(x) % 60)
-    return f"{int(x) // 60:02}:{int(x) % 60:02}"
+    m = int(x)
+    if 0 <= m < len(_HOUR_MINUTES):
+        return _HOUR_MINUTES[m]
+    return f"{m // 60:02}:{m % 60:02}"
 
 
 GLEISNAME_REGEXP = re.compile(r"([a-zA-Z ]*)([0-9]*)([a-zA-Z ]*)")
@@ -605,15 +613,15 @@ class Gleisbelegung:
         :param slots: alles slots müssen zum gleichen gleis gehären
         :return: generator von SlotWarnung
         """
-        slots = sorted(slots, key=lambda s: s.zeit)
+        slots = iter(sorted(slots, key=operator.attrgetter('zeit')))
         try:
-            letzter = slots[0]
-        except IndexError:
+            letzter = next(slots)
+        except StopIteration:
             return None
 
         frei = letzter.zeit + letzter.dauer
         konflikt = None
-        for slot in slots[1:]:
+        for slot in slots:
             if slot.zeit < frei:
                 if konflikt is None:
                     konflikt = SlotWarnung(gleise={letzter.gleis}, zeit=letzter.zeit, status="gleis")
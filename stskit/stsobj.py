@@ -13,6 +13,7 @@ die update-methoden erwarten geparste xml-daten in untangle.Element objekten.
 """
 
 import datetime
+import functools
 import logging
 import networkx as nx
 import numpy as np
@@ -91,6 +92,48 @@ def format_verspaetung(verspaetung: Optional[int]) -> str:
         return ""
 
 
+_FLAG_ZID_MUSTER = {'E': re.compile(r"E[0-9]?\(([0-9]+)\)"),
+                    'F': re.compile(r"F[0-9]?\(([0-9]+)\)"),
+                    'K': re.compile(r"K[0-9]?\(([0-9]+)\)")}
+_LOKWECHSEL_MUSTER = re.compile(r"W\[([0-9]+)]\[([0-9]+)]")
+
+
+@functools.lru_cache(maxsize=1024)
+def flag_zid(flags: str, flag: str) -> Optional[int]:
+    """
+    zid aus einem zugfolge-flag lesen.
+
+    die flags-strings wiederholen sich in einem stellwerk oft,
+    das resultat wird deshalb zwischengespeichert.
+
+    :param flags: flags-string einer fahrplanzeile
+    :param flag: 'E' (ersatzzug), 'F' (flügelung) oder 'K' (kupplung)
+    :return: zid oder None, wenn das flag nicht vorkommt.
+    """
+    mo = _FLAG_ZID_MUSTER[flag].search(flags)
+    if mo:
+        return int(mo.group(1))
+    else:
+        return None
+
+
+@functools.lru_cache(maxsize=1024)
+def flag_lokwechsel(flags: str) -> Optional[Tuple[int, int]]:
+    """
+    elementnummern aus dem lokwechsel-flag lesen.
+
+    das resultat wird wie bei flag_zid zwischengespeichert.
+
+    :param flags: flags-string einer fahrplanzeile
+    :return: zweier-tuple mit element-nummern oder None, wenn das flag nicht vorkommt.
+    """
+    mo = _LOKWECHSEL_MUSTER.search(flags)
+    if mo:
+        return int(mo.group(1)), int(mo.group(2))
+    else:
+        return None
+
+
 class AnlagenInfo:
     """
     objektklasse für anlageninformationen.
@@ -692,11 +735,7 @@ class FahrplanZeile:
 
         die zid kann vom plugin-client zum ersatzzug-attribut aufgelöst werden.
         """
-        mo = re.search(r"E[0-9]?\(([0-9]+)\)", self.flags)
-        if mo:
-            return int(mo.group(1))
-        else:
-            return None
+        return flag_zid(self.flags, 'E')
 
     def fluegel_zid(self) -> Optional[int]:
         """
@@ -704,11 +743,7 @@ class FahrplanZeile:
 
         die zid kann vom plugin-client zum fluegelzug-attribut aufgelöst werden.
         """
-        mo = re.search(r"F[0-9]?\(([0-9]+)\)", self.flags)
-        if mo:
-            return int(mo.group(1))
-        else:
-            return None
+        return flag_zid(self.flags, 'F')
 
     def kuppel_zid(self) -> Optional[int]:
         """
@@ -716,11 +751,7 @@ class FahrplanZeile:
 
         die zid kann vom plugin-client zum kuppelzug-attribut aufgelöst werden.
         """
-        mo = re.search(r"K[0-9]?\(([0-9]+)\)", self.flags)
-        if mo:
-            return int(mo.group(1))
-        else:
-            return None
+        return flag_zid(self.flags, 'K')
 
     def lokumlauf(self) -> bool:
         """
@@ -736,11 +767,7 @@ class FahrplanZeile:
 
         :return: zweier-tuple mit element-nummern der ein- und ausfahrten (beliebige reihenfolge) oder None.
         """
-        mo = re.search(r"W\[([0-9]+)]\[([0-9]+)]", self.flags)
-        if mo:
-            return int(mo.group(1)), int(mo.group(2))
-        else:
-            return None
+        return flag_lokwechsel(self.flags)
 
     def richtungswechsel(self) -> bool:
         """
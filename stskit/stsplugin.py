@@ -130,6 +130,21 @@ class PluginClient:
         self.connected = trio.Event()
         self.registered = trio.Event()
 
+    @staticmethod
+    def _format_request(tag, **kwargs) -> str:
+        """
+        anfrage als xml-zeile formatieren.
+
+        :param tag: name des xml-tags
+        :param kwargs: (dict) attribute des xml-tags
+        :return: xml-tag inklusive zeilenende
+        """
+        args = [f"{k}='{v}'" for k, v in kwargs.items()]
+        args = " ".join(args)
+        req = f"<{tag} {args} />"
+        logger.debug("senden: " + req)
+        return req + "\n"
+
     async def _send_request(self, tag, **kwargs):
         """
         anfrage senden.
@@ -140,14 +155,37 @@ class PluginClient:
         :param kwargs: (dict) attribute des xml-tags
         :return: None
         """
-        args = [f"{k}='{v}'" for k, v in kwargs.items()]
-        args = " ".join(args)
-        req = f"<{tag} {args} />"
-        logger.debug("senden: " + req)
-        req += "\n"
-        data = req.encode()
+        data = self._format_request(tag, **kwargs).encode()
         await self._stream.send_all(data)
 
+    async def _send_requests(self, requests: Iterable[str]):
+        """
+        mehrere formatierte anfragen in einem paket senden.
+
+        der server bearbeitet die anfragen der reihe nach.
+        die antworten treffen deshalb in der gleichen reihenfolge ein
+        und müssen vom aufrufer nacheinander aus dem antwort-channel gelesen werden.
+
+        :param requests: von _format_request erzeugte xml-zeilen
+        :return: None
+        """
+        data = "".join(requests).encode()
+        if data:
+            await self._stream.send_all(data)
+
+    async def _discard_responses(self, count: int):
+        """
+        ausstehende antworten aus dem antwort-channel lesen und verwerfen.
+
+        wird nach einem abbruch einer mehrfachanfrage aufgerufen,
+        damit die übrigen antworten nicht den folgenden anfragen zugeordnet werden.
+
+        :param count: anzahl ausstehender antworten
+        :return: None
+        """
+        for _ in range(count):
+            await self._antwort_channel_out.receive()
+
     async def receiver(self, *, task_status=trio.TASK_STATUS_IGNORED):
         """
         empfangsschleife: antworten empfangen und verteilen
@@ -383,6 +421,8 @@ class PluginClient:
         wenn ein fehler auftritt (weil z.b. der zug nicht mehr im stellwerk ist),
         wird der zug aus der zugliste gelöscht.
 
+        die anfragen werden zusammen gesendet und die antworten danach in der gleichen reihenfolge empfangen.
+
         :param zid: einzelne zug-id, iterable von zug-ids, oder None (alle in der liste).
         :return: None
         """
@@ -394,29 +434,38 @@ class PluginClient:
         else:
             zids = list(self.zugliste.keys())
 
+        gueltige_zids = []
         for zid in zids:
             if zid > 0:
-                await self._send_request("zugdetails", zid=zid)
-                response = await self._antwort_channel_out.receive()
+                gueltige_zids.append(zid)
             else:
                 logger.warning(f"request_zugdetails: anfrage mit zid={zid} ignoriert.")
-                continue
+        zids = gueltige_zids
+        await self._send_requests(self._format_request("zugdetails", zid=zid) for zid in zids)
 
-            try:
-                zug = self.zugliste[zid]
-            except KeyError:
-                zug = ZugDetails()
-                zug.zid = zid
-                self.zugliste[zid] = zug
+        empfangen = 0
+        try:
+            for zid in zids:
+                response = await self._antwort_channel_out.receive()
+                empfangen += 1
 
-            try:
-                zug.update(response.zugdetails)
-                logger.debug(f"request_zugdetails: {zug}")
-            except AttributeError:
-                del self.zugliste[zid]
-                log_status_warning("request_zugdetails", response)
-            else:
-                self.zuggattungen.add(zug.gattung)
+                try:
+                    zug = self.zugliste[zid]
+                except KeyError:
+                    zug = ZugDetails()
+                    zug.zid = zid
+                    self.zugliste[zid] = zug
+
+                try:
+                    zug.update(response.zugdetails)
+                    logger.debug(f"request_zugdetails: {zug}")
+                except AttributeError:
+                    del self.zugliste[zid]
+                    log_status_warning("request_zugdetails", response)
+                else:
+                    self.zuggattungen.add(zug.gattung)
+        finally:
+            await self._discard_responses(len(zids) - empfangen)
 
     async def request_ereignis(self, art, zids: Iterable[int]):
         """
@@ -432,11 +481,30 @@ class PluginClient:
         :param zids: menge oder sequenz von zug-id-nummern
         :return: None
         """
-        zids = set(zids).difference(self.registrierte_ereignisse[art])
-        for zid in zids:
-            if zid in self.zugliste and (art == "einfahrt" or self.zugliste[zid].sichtbar):
-                await self._send_request("ereignis", art=art, zid=zid)
-                self.registrierte_ereignisse[art].add(zid)
+        await self.request_ereignisse((art,), zids)
+
+    async def request_ereignisse(self, arten: Iterable[str], zids: Iterable[int]):
+        """
+        ereignismeldungen von mehreren arten anfordern
+
+        wie request_ereignis, aber alle neuen anforderungen werden gesammelt und in einem paket gesendet.
+        der server beantwortet ereignis-anforderungen nicht,
+        es muss also nicht auf antworten gewartet werden.
+
+        :param arten: arten der ereignisse, cf. model.Ereignis.arten
+        :param zids: menge oder sequenz von zug-id-nummern
+        :return: None
+        """
+        zids = set(zids)
+        requests = []
+        for art in arten:
+            registriert = self.registrierte_ereignisse[art]
+            for zid in zids.difference(registriert):
+                if zid in self.zugliste and (art == "einfahrt" or self.zugliste[zid].sichtbar):
+                    requests.append(self._format_request("ereignis", art=art, zid=zid))
+                    registriert.add(zid)
+
+        await self._send_requests(requests)
 
     async def request_zugfahrplan(self, zid: Optional[Union[int, Iterable[int]]] = None):
         """
@@ -453,26 +521,36 @@ class PluginClient:
             zids = [zid]
         else:
             zids = self.zugliste.keys()
+
+        zuege = []
         for zid in map(int, zids):
             try:
                 zug = self.zugliste[zid]
                 zug.fahrplan = []
             except KeyError:
                 continue
+            zuege.append(zug)
 
-            await self._send_request("zugfahrplan", zid=zid)
-            response = await self._antwort_channel_out.receive()
+        await self._send_requests(self._format_request("zugfahrplan", zid=zug.zid) for zug in zuege)
 
-            try:
-                zug.ziel_index = None
-                for gleis in response.zugfahrplan.gleis:
-                    zeile = FahrplanZeile(zug).update(gleis)
-                    zug.fahrplan.append(zeile)
-                    if zug.plangleis == zeile.plan:
-                        zug.ziel_index = len(zug.fahrplan) - 1
-                    logger.debug(f"request_zugfahrplan: {zeile}")
-            except AttributeError:
-                log_status_warning("request_zugfahrplan", response)
+        empfangen = 0
+        try:
+            for zug in zuege:
+                response = await self._antwort_channel_out.receive()
+                empfangen += 1
+
+                try:
+                    zug.ziel_index = None
+                    for gleis in response.zugfahrplan.gleis:
+                        zeile = FahrplanZeile(zug).update(gleis)
+                        zug.fahrplan.append(zeile)
+                        if zug.plangleis == zeile.plan:
+                            zug.ziel_index = len(zug.fahrplan) - 1
+                        logger.debug(f"request_zugfahrplan: {zeile}")
+                except AttributeError:
+                    log_status_warning("request_zugfahrplan", response)
+        finally:
+            await self._discard_responses(len(zuege) - empfangen)
 
     async def request_zugliste(self):
         """
@@ -44,8 +44,7 @@ async def query(client: PluginClient, args: argparse.Namespace) -> None:
         await client.request_zugliste()
         await client.request_zugdetails()
         await client.resolve_zugflags()
-        for art in Ereignis.arten:
-            await client.request_ereignis(art, client.zugliste.keys())
+        await client.request_ereignisse(Ereignis.arten, client.zugliste.keys())
         await trio.sleep(30)
 
 
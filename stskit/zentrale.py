@@ -97,8 +97,7 @@ class DatenZentrale:
         """
 
         await self._get_sts_data()
-        for art in Ereignis.arten:
-            await self.client.request_ereignis(art, self.client.zugliste.keys())
+        await self.client.request_ereignisse(Ereignis.arten, self.client.zugliste.keys())
 
         if not self.anlage:
             self.anlage = Anlage(self.client.anlageninfo)
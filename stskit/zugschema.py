@@ -9,6 +9,7 @@ Die Zugbeschriftung definiert, wie Züge in den Grafiken beschriftet werden.
 Das Modul enthält neben den Datenklassen auch Modelle für Qt-Widgets.
 """
 
+import functools
 import json
 import logging
 import os
@@ -25,6 +26,22 @@ from stskit.stsobj import time_to_minutes, ZugDetails
 logger = logging.getLogger(__name__)
 logger.addHandler(logging.NullHandler())
 
+
+@functools.lru_cache(maxsize=None)
+def farbe_rgb(farbe: str) -> Tuple[int, ...]:
+    """
+    Matplotlib-Farbcode in RGB-Tupel umrechnen.
+
+    Die Umrechnung ist unveränderlich und wird deshalb pro Farbcode zwischengespeichert.
+
+    :param farbe: Matplotlib-Farbcode
+    :return: tupel (r,g,b). r,g,b sind Integer im Bereich 0-255.
+    """
+
+    frgb = mpl.colors.to_rgb(farbe)
+    return tuple(round(255 * v) for v in frgb)
+
+
 REGIONEN_SCHEMA = {
     "Bern - Lötschberg": "Schweiz",
     "Italien Nord": "Italien",
@@ -293,10 +310,7 @@ class Zugschema:
         :return: tupel (r,g,b). r,g,b sind Integer im Bereich 0-255.
         """
 
-        farbe = self.zugfarbe(zug)
-        frgb = mpl.colors.to_rgb(farbe)
-        rgb = [round(255 * v) for v in frgb]
-        return tuple(rgb)
+        return farbe_rgb(self.zugfarbe(zug))
 
     def kategorie_farbe(self, kat: str) -> str:
         """
@@ -320,10 +334,7 @@ class Zugschema:
         :return: tupel (r,g,b). r,g,b sind Integer im Bereich 0-255.
         """
 
-        farbe = self.farben[kat]
-        frgb = mpl.colors.to_rgb(farbe)
-        rgb = [round(255 * v) for v in frgb]
-        return tuple(rgb)
+        return farbe_rgb(self.farben[kat])
 
 
 class ZugschemaAuswahlModell(QtCore.QAbstractTableModel):
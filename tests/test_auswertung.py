@@ -28,6 +28,19 @@ class TestFahrzeitAuswertung(unittest.TestCase):
         self.assertAlmostEqual(fa.summe.at["A2", "B1"], 0)
         self.assertAlmostEqual(fa.summe.at["A2", "B2"], 0)
 
+    def test_get_fahrzeit_cache(self):
+        fa = auswertung.FahrzeitAuswertung()
+        fa.set_koordinaten(self.test_anlage)
+        zug = ZugDetails()
+        zug.name = "RE 1"
+
+        fa.add_fahrzeit(zug, "A1", "B1", 20)
+        self.assertAlmostEqual(fa.get_fahrzeit("A1", "B1"), 20)
+        self.assertAlmostEqual(fa.get_fahrzeit("A1", "B1"), 20)
+
+        fa.add_fahrzeit(zug, "A1", "B1", 30)
+        self.assertAlmostEqual(fa.get_fahrzeit("A1", "B1"), 25)
+
 
 if __name__ == '__main__':
     unittest.main()
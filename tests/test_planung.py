@@ -2,451 +2,268 @@ import datetime
 import unittest
 from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Set, Tuple, Union
 
+import networkx as nx
+import numpy as np
+
 import planung
 from stsobj import ZugDetails, FahrplanZeile
 
 
-def beispiel_zugliste(_planung: planung.Planung) -> Dict[int, planung.ZugDetailsPlanung]:
-    zugliste = {}
-
-    # gewoehnlicher zug mit halt an einer station.
-    # befindet sich zwischen einfahrt A und erstem halt an gleis 1.
-    zug = planung.ZugDetailsPlanung()
-    zug.zid = 1
-    zug.name = "Zug 1"
-    zug.von = "A"
-    zug.nach = "B"
-    zug.gleis = zug.plangleis = "1"
-    zug.sichtbar = True
-    zugliste[zug.zid] = zug
-
-    ziel = planung.ZugZielPlanung(zug)
-    ziel.gleis = ziel.plan = "A"
-    ziel.an = datetime.time(hour=9, minute=5)
-    ziel.ab = datetime.time(hour=9, minute=5)
-    ziel.einfahrt = True
-    zug.fahrplan.append(ziel)
-
-    ziel = planung.ZugZielPlanung(zug)
-    ziel.gleis = ziel.plan = "1"
-    ziel.mindestaufenthalt = 1
-    ziel.an = datetime.time(hour=9, minute=10)
-    ziel.ab = datetime.time(hour=9, minute=11)
-    zug.fahrplan.append(ziel)
-    zk = planung.PlanmaessigeAbfahrt(_planung)
-    ziel.auto_korrektur = zk
-
-    ziel = planung.ZugZielPlanung(zug)
-    ziel.gleis = ziel.plan = "B"
-    ziel.an = datetime.time(hour=9, minute=17)
-    ziel.ab = datetime.time(hour=9, minute=17)
-    ziel.ausfahrt = True
-    zug.fahrplan.append(ziel)
-
-    # zug mit nummernwechsel an gleis 2. noch nicht eingefahren.
-    zug = planung.ZugDetailsPlanung()
-    zug.zid = 2
-    zug.name = "Zug 2"
-    zug.von = "A"
-    zug.nach = "2"
-    zug.gleis = zug.plangleis = "2"
-    zug.sichtbar = False
-    zugliste[zug.zid] = zug
-
-    ziel = planung.ZugZielPlanung(zug)
-    ziel.gleis = ziel.plan = "A"
-    ziel.an = datetime.time(hour=10, minute=5)
-    ziel.ab = datetime.time(hour=10, minute=5)
-    ziel.einfahrt = True
-    zug.fahrplan.append(ziel)
-
-    ziel = planung.ZugZielPlanung(zug)
-    ziel.gleis = ziel.plan = "2"
-    ziel.mindestaufenthalt = 2  # richtungswechsel
-    ziel.an = datetime.time(hour=10, minute=10)
-    ziel.flags = "RE(3)"
-    zug.fahrplan.append(ziel)
-    zk = planung.Ersatzzug(_planung)
-    ziel.auto_korrektur = zk
-    anschluss = ziel
-
-    # zug 3: ersatzzug von zug 2
-    zug = planung.ZugDetailsPlanung()
-    zug.zid = 3
-    zug.name = "Zug 3"
-    zug.von = "2"
-    zug.nach = "B"
-    zug.gleis = zug.plangleis = "2"
-    zug.sichtbar = False
-    zugliste[zug.zid] = zug
-    ziel.ersatzzug = zug
-
-    ziel = planung.ZugZielPlanung(zug)
-    ziel.gleis = ziel.plan = "2"
-    ziel.mindestaufenthalt = 0
-    ziel.an = datetime.time(hour=10, minute=15)
-    ziel.ab = datetime.time(hour=10, minute=16)
-    zug.fahrplan.append(ziel)
-    zk = planung.AnkunftAbwarten(_planung)
-    zk.ursprung = anschluss
-    ziel.auto_korrektur = zk
-
-    ziel = planung.ZugZielPlanung(zug)
-    ziel.gleis = ziel.plan = "B"
-    ziel.an = datetime.time(hour=10, minute=22)
-    ziel.ab = datetime.time(hour=10, minute=22)
-    ziel.ausfahrt = True
-    zug.fahrplan.append(ziel)
-
-    # zug 4 kuppelt mit zug 5
-    zug = planung.ZugDetailsPlanung()
-    zug.zid = 4
-    zug.name = "Zug 4"
-    zug.von = "A"
-    zug.nach = "3"
-    zug.gleis = zug.plangleis = "3"
-    zug.sichtbar = False
-    zugliste[zug.zid] = zug
-
-    ziel = planung.ZugZielPlanung(zug)
-    ziel.gleis = ziel.plan = "A"
-    ziel.an = datetime.time(hour=11, minute=5)
-    ziel.ab = datetime.time(hour=11, minute=5)
-    ziel.einfahrt = True
-    zug.fahrplan.append(ziel)
-
-    ziel = planung.ZugZielPlanung(zug)
-    ziel.gleis = ziel.plan = "3"
-    ziel.mindestaufenthalt = 0
-    ziel.an = datetime.time(hour=11, minute=10)
-    ziel.flags = "K(5)"
-    zug.fahrplan.append(ziel)
-    zk = planung.Kupplung(_planung)
-    ziel.auto_korrektur = zk
-    anschluss = ziel
-
-    # zug 5: kuppelt an zug 4 und faehrt dann weiter
-    zug = planung.ZugDetailsPlanung()
-    zug.zid = 5
-    zug.name = "Zug 5"
-    zug.von = "C"
-    zug.nach = "B"
-    zug.gleis = zug.plangleis = "3"
-    zug.sichtbar = False
-    zugliste[zug.zid] = zug
-    ziel.kuppelzug = zug
-
-    ziel = planung.ZugZielPlanung(zug)
-    ziel.gleis = ziel.plan = "C"
-    ziel.an = datetime.time(hour=11, minute=8)
-    ziel.ab = datetime.time(hour=11, minute=8)
-    ziel.einfahrt = True
-    zug.fahrplan.append(ziel)
-
-    ziel = planung.ZugZielPlanung(zug)
-    ziel.gleis = ziel.plan = "3"
-    ziel.mindestaufenthalt = 0
-    ziel.an = datetime.time(hour=11, minute=14)
-    ziel.ab = datetime.time(hour=11, minute=16)
-    zug.fahrplan.append(ziel)
-    zk = planung.AnkunftAbwarten(_planung)
-    zk.ursprung = anschluss
-    ziel.auto_korrektur = zk
-
-    ziel = planung.ZugZielPlanung(zug)
-    ziel.gleis = ziel.plan = "B"
-    ziel.an = datetime.time(hour=11, minute=21)
-    ziel.ab = datetime.time(hour=11, minute=21)
-    ziel.ausfahrt = True
-    zug.fahrplan.append(ziel)
-
-    # zug 6: fluegelt zug 7
-    zug = planung.ZugDetailsPlanung()
-    zug.zid = 6
-    zug.name = "Zug 6"
-    zug.von = "A"
-    zug.nach = "B"
-    zug.gleis = zug.plangleis = "4"
-    zug.sichtbar = False
-    zugliste[zug.zid] = zug
-
-    ziel = planung.ZugZielPlanung(zug)
-    ziel.gleis = ziel.plan = "A"
-    ziel.an = datetime.time(hour=12, minute=8)
-    ziel.ab = datetime.time(hour=12, minute=8)
-    ziel.einfahrt = True
-    zug.fahrplan.append(ziel)
-
-    ziel = planung.ZugZielPlanung(zug)
-    ziel.gleis = ziel.plan = "4"
-    ziel.mindestaufenthalt = 0
-    ziel.flags = "F(7)"
-    ziel.an = datetime.time(hour=12, minute=14)
-    ziel.ab = datetime.time(hour=12, minute=16)
-    zug.fahrplan.append(ziel)
-    zk = planung.Fluegelung(_planung)
-    ziel.auto_korrektur = zk
-    anschluss = ziel
-
-    ziel = planung.ZugZielPlanung(zug)
-    ziel.gleis = ziel.plan = "B"
-    ziel.an = datetime.time(hour=12, minute=21)
-    ziel.ab = datetime.time(hour=12, minute=21)
-    ziel.ausfahrt = True
-    zug.fahrplan.append(ziel)
-
-    # zug 7 fluegelt von zug 6
-    zug = planung.ZugDetailsPlanung()
-    zug.zid = 7
-    zug.name = "Zug 7"
-    zug.von = "4"
-    zug.nach = "C"
-    zug.gleis = zug.plangleis = "4"
-    zug.sichtbar = False
-    zugliste[zug.zid] = zug
-    anschluss.fluegelzug = zug
-
-    ziel = planung.ZugZielPlanung(zug)
-    ziel.gleis = ziel.plan = "4"
-    ziel.mindestaufenthalt = 0
-    ziel.an = datetime.time(hour=12, minute=14)
-    ziel.ab = datetime.time(hour=12, minute=18)
-    zug.fahrplan.append(ziel)
-    zk = planung.AbfahrtAbwarten(_planung)
-    zk.ursprung = anschluss
-    zk.wartezeit = 2
-    ziel.auto_korrektur = zk
-
-    ziel = planung.ZugZielPlanung(zug)
-    ziel.gleis = ziel.plan = "C"
-    ziel.an = datetime.time(hour=12, minute=22)
-    ziel.ab = datetime.time(hour=12, minute=22)
-    ziel.ausfahrt = True
-    zug.fahrplan.append(ziel)
-
-    # zug 8: fluegelt zug 9. bispiel aus hamm
-    zug = planung.ZugDetailsPlanung()
-    zug.zid = 8
-    zug.name = "ICE 940"
-    zug.von = "Neubeckum"
-    zug.nach = "Kamen"
-    zug.gleis = zug.plangleis = "10"
-    zug.sichtbar = False
-    zugliste[zug.zid] = zug
-
-    ziel = planung.ZugZielPlanung(zug)
-    ziel.gleis = ziel.plan = "Neubeckum"
-    ziel.an = datetime.time(hour=14, minute=48)
-    ziel.ab = datetime.time(hour=14, minute=48)
-    ziel.einfahrt = True
-    zug.fahrplan.append(ziel)
-
-    ziel = planung.ZugZielPlanung(zug)
-    ziel.gleis = ziel.plan = "10"
-    ziel.mindestaufenthalt = 0
-    ziel.flags = "F(9)"
-    ziel.an = datetime.time(hour=14, minute=48)
-    ziel.ab = datetime.time(hour=14, minute=52)
-    zug.fahrplan.append(ziel)
-    zk = planung.Fluegelung(_planung)
-    ziel.auto_korrektur = zk
-    anschluss = ziel
-
-    ziel = planung.ZugZielPlanung(zug)
-    ziel.gleis = ziel.plan = "Kamen"
-    ziel.an = datetime.time(hour=14, minute=52)
-    ziel.ab = datetime.time(hour=14, minute=52)
-    ziel.ausfahrt = True
-    zug.fahrplan.append(ziel)
-
-    # zug 9 fluegelt von zug 8
-    zug = planung.ZugDetailsPlanung()
-    zug.zid = 9
-    zug.name = "ICE 950"
-    zug.von = ""
-    zug.nach = "Unna"
-    zug.gleis = zug.plangleis = "10"
-    zug.sichtbar = False
-    zugliste[zug.zid] = zug
-    anschluss.fluegelzug = zug
-
-    ziel = planung.ZugZielPlanung(zug)
-    ziel.gleis = ziel.plan = "10"
-    ziel.mindestaufenthalt = 0
-    ziel.an = datetime.time(hour=14, minute=48)
-    ziel.ab = datetime.time(hour=14, minute=54)
-    zug.fahrplan.append(ziel)
-    zk = planung.AbfahrtAbwarten(_planung)
-    zk.ursprung = anschluss
-    zk.wartezeit = 2
-    ziel.auto_korrektur = zk
-
-    ziel = planung.ZugZielPlanung(zug)
-    ziel.gleis = ziel.plan = "Unna"
-    ziel.an = datetime.time(hour=14, minute=54)
-    ziel.ab = datetime.time(hour=14, minute=54)
-    ziel.ausfahrt = True
-    zug.fahrplan.append(ziel)
+def beispiel_zugliste() -> List[ZugDetails]:
+    """
+    beispielzüge, wie sie der PluginClient liefert
+
+    die züge befinden sich noch ausserhalb des stellwerks.
+    die verspätungskorrekturen werden von der planung beim übernehmen der züge definiert.
+
+    :return: liste von ZugDetails
+    """
+
+    zugliste = []
+
+    def zug_erstellen(zid: int, name: str, von: str, nach: str,
+                      fahrplan: List[Tuple[str, Optional[datetime.time], Optional[datetime.time], str]]):
+        zug = ZugDetails()
+        zug.zid = zid
+        zug.name = name
+        zug.von = von
+        zug.nach = nach
+        zug.sichtbar = False
+        for gleis, an, ab, flags in fahrplan:
+            fpz = FahrplanZeile(zug)
+            fpz.gleis = fpz.plan = gleis
+            fpz.an = an
+            fpz.ab = ab
+            fpz.flags = flags
+            zug.fahrplan.append(fpz)
+        zug.gleis = zug.plangleis = zug.fahrplan[0].plan
+        zugliste.append(zug)
+
+    # gewoehnlicher zug mit halt an gleis 1.
+    zug_erstellen(1, "Zug 1", "A", "B",
+                  [("1", datetime.time(hour=9, minute=10), datetime.time(hour=9, minute=11), "")])
+
+    # zug 2 mit richtungswechsel und nummernwechsel auf zug 3 an gleis 2.
+    zug_erstellen(2, "Zug 2", "A", "Gleis 2",
+                  [("2", datetime.time(hour=10, minute=10), None, "RE(3)")])
+    zug_erstellen(3, "Zug 3", "Gleis 2", "B",
+                  [("2", datetime.time(hour=10, minute=15), datetime.time(hour=10, minute=16), "")])
+
+    # zug 4 kuppelt an gleis 3 an zug 5. zug 5 faehrt weiter.
+    zug_erstellen(4, "Zug 4", "A", "Gleis 3",
+                  [("3", datetime.time(hour=11, minute=10), None, "K(5)")])
+    zug_erstellen(5, "Zug 5", "C", "B",
+                  [("3", datetime.time(hour=11, minute=14), datetime.time(hour=11, minute=16), "")])
+
+    # zug 6 fluegelt an gleis 4 zug 7.
+    zug_erstellen(6, "Zug 6", "A", "B",
+                  [("4", datetime.time(hour=12, minute=14), datetime.time(hour=12, minute=16), "F(7)")])
+    zug_erstellen(7, "Zug 7", "Gleis 4", "C",
+                  [("4", datetime.time(hour=12, minute=14), datetime.time(hour=12, minute=18), "")])
+
+    # zug 8 fluegelt zug 9. beispiel aus hamm.
+    zug_erstellen(8, "ICE 940", "Neubeckum", "Kamen",
+                  [("10", datetime.time(hour=14, minute=48), datetime.time(hour=14, minute=52), "F(9)")])
+    zug_erstellen(9, "ICE 950", "Gleis 10", "Unna",
+                  [("10", datetime.time(hour=14, minute=48), datetime.time(hour=14, minute=54), "")])
+
+    # zug 10 faehrt an gleis 5 durch.
+    zug_erstellen(10, "Zug 10", "A", "B",
+                  [("5", datetime.time(hour=13, minute=10), datetime.time(hour=13, minute=10), "D")])
 
     return zugliste
 
 
 class TestZeitKorrektur(unittest.TestCase):
+    """
+    verspätungsberechnung der automatischen korrekturen
+
+    die tests laufen über verspaetungen_korrigieren und decken damit die vektorisierten korrektur-codes ab.
+    """
 
     def setUp(self) -> None:
         super().setUp()
         self.planung = planung.Planung()
-        self.zugliste = beispiel_zugliste(self.planung)
+        self.planung.zuege_uebernehmen(beispiel_zugliste())
+
+    def verspaetungen(self, zid: int) -> List[Tuple[int, int]]:
+        """
+        verspaetung_an und verspaetung_ab aller fahrplanziele eines zuges
+
+        :param zid: zug-id
+        :return: liste von (verspaetung_an, verspaetung_ab) in der reihenfolge des fahrplans
+        """
+
+        return [(ziel.verspaetung_an, ziel.verspaetung_ab) for ziel in self.planung.zugliste[zid].fahrplan]
+
+    def knoten_verspaetung_ab(self, zid: int, index: int) -> int:
+        """
+        abfahrtsverspätung eines fahrplanziels aus den knotendaten des zielgraphen
+
+        :param zid: zug-id
+        :param index: index des ziels im fahrplan
+        :return: v_ab in minuten
+        """
+
+        ziel = self.planung.zugliste[zid].fahrplan[index]
+        return self.planung.zielgraph.nodes[planung.ZugZielNode.neu(ziel)]['v_ab']
+
+    def test_korrekturen(self):
+        def korrekturen(zid):
+            return [type(ziel.auto_korrektur) for ziel in self.planung.zugliste[zid].fahrplan]
+
+        self.assertEqual([planung.Einfahrtszeit, planung.Planhalt, planung.Durchfahrt], korrekturen(1))
+        self.assertEqual([planung.Einfahrtszeit, planung.ErsatzUrsprung], korrekturen(2))
+        self.assertEqual([planung.ErsatzZiel, planung.Durchfahrt], korrekturen(3))
+        self.assertEqual([planung.Einfahrtszeit, planung.KupplungUrsprung], korrekturen(4))
+        self.assertEqual([planung.Einfahrtszeit, planung.KupplungZiel, planung.Durchfahrt], korrekturen(5))
+        self.assertEqual([planung.Einfahrtszeit, planung.FluegelungUrsprung, planung.Durchfahrt], korrekturen(6))
+        self.assertEqual([planung.FluegelungZiel, planung.Durchfahrt], korrekturen(7))
+        self.assertEqual([planung.Einfahrtszeit, planung.Durchfahrt, planung.Durchfahrt], korrekturen(10))
+
+        # abfahrt des stammziels = ankunft des folgezuges
+        self.assertEqual(datetime.time(hour=10, minute=15), self.planung.zugliste[2].fahrplan[1].ab)
+        self.assertEqual(datetime.time(hour=11, minute=14), self.planung.zugliste[4].fahrplan[1].ab)
+
+    def test_einfahrt(self):
+        # einfahrt 9:10 + 3 = 9:13 liegt vor der simzeit 9:20
+        zug = self.planung.zugliste[1]
+        zug.verspaetung = 3
+        self.planung.simzeit_minuten = 9 * 60 + 20
+        self.planung.verspaetungen_korrigieren()
+        self.assertEqual([(3, 10), (10, 9), (9, 9)], self.verspaetungen(1))
 
-    def test_planmaessige_abfahrt(self):
-        zug = self.zugliste[1]
-        ziel = zug.fahrplan[1]
+        # einfahrt 9:10 + 15 = 9:25 liegt nach der simzeit
+        zug.verspaetung = 15
+        self.planung.verspaetungen_korrigieren()
+        self.assertEqual([(15, 15), (15, 14), (14, 14)], self.verspaetungen(1))
 
-        ziel.verspaetung_an = 0
-        ziel.auto_korrektur.anwenden(zug, ziel)
-        self.assertEqual(ziel.verspaetung_ab, 0)
+    def test_planmaessige_abfahrt(self):
+        # ankunft 9:10, abfahrt 9:11, kein mindestaufenthalt
+        zug = self.planung.zugliste[1]
 
-        ziel.verspaetung_an = 3
-        ziel.auto_korrektur.anwenden(zug, ziel)
-        self.assertEqual(ziel.verspaetung_ab, 3)
+        zug.verspaetung = 0
+        self.planung.verspaetungen_korrigieren()
+        self.assertEqual([(0, 0), (0, 0), (0, 0)], self.verspaetungen(1))
 
-        ziel.verspaetung_an = 3
-        ziel.ab = datetime.time(hour=9, minute=13)
-        ziel.auto_korrektur.anwenden(zug, ziel)
-        self.assertEqual(ziel.verspaetung_ab, 1)
+        zug.verspaetung = 3
+        self.planung.verspaetungen_korrigieren()
+        self.assertEqual([(3, 3), (3, 2), (2, 2)], self.verspaetungen(1))
 
-        ziel.verspaetung_an = 3
-        ziel.ab = datetime.time(hour=9, minute=16)
-        ziel.auto_korrektur.anwenden(zug, ziel)
-        self.assertEqual(ziel.verspaetung_ab, 0)
+    def test_durchfahrt(self):
+        zug = self.planung.zugliste[10]
+        zug.verspaetung = 4
+        self.planung.verspaetungen_korrigieren()
+        self.assertEqual([(4, 4), (4, 4), (4, 4)], self.verspaetungen(10))
 
     def test_ersatzzug(self):
-        zug1 = self.zugliste[2]
-        ziel1 = zug1.fahrplan[-1]
-        zug2 = self.zugliste[3]
-        ziel2 = zug2.fahrplan[0]
-
-        ziel1.verspaetung_an = 0
-        ziel1.auto_korrektur.anwenden(zug1, ziel1)
-        self.assertEqual(ziel1.verspaetung_ab, 0)
-        self.assertEqual(ziel1.ersatzzug.verspaetung, 0)
-        self.assertEqual(ziel2.verspaetung_an, 0)
-        self.assertEqual(ziel2.verspaetung_ab, 0)
-
-        ziel1.verspaetung_an = 2
-        ziel1.auto_korrektur.anwenden(zug1, ziel1)
-        self.assertEqual(ziel1.verspaetung_ab, 0)
-        self.assertEqual(ziel1.ersatzzug.verspaetung, 0)
-        self.assertEqual(ziel2.verspaetung_an, 0)
-        self.assertEqual(ziel2.verspaetung_ab, 0)
-
-        ziel1.verspaetung_an = 10
-        ziel1.auto_korrektur.anwenden(zug1, ziel1)
-        self.assertEqual(ziel1.verspaetung_ab, 7)
-        self.assertEqual(ziel1.ersatzzug.verspaetung, 7)
-        self.assertEqual(ziel1.ersatzzug.fahrplan[0].verspaetung_an, 7)
-        self.assertEqual(ziel1.ersatzzug.fahrplan[0].verspaetung_ab, 6)
+        # ankunft zug 2: 10:10, mindestaufenthalt 2 (richtungswechsel), nummernwechsel: 10:15, abfahrt zug 3: 10:16
+        zug = self.planung.zugliste[2]
+
+        zug.verspaetung = 0
+        self.planung.verspaetungen_korrigieren()
+        self.assertEqual([(0, 0), (0, 0)], self.verspaetungen(2))
+        self.assertEqual([(0, 0), (0, 0)], self.verspaetungen(3))
+
+        zug.verspaetung = 2
+        self.planung.verspaetungen_korrigieren()
+        self.assertEqual([(2, 2), (2, 0)], self.verspaetungen(2))
+        self.assertEqual([(0, 0), (0, 0)], self.verspaetungen(3))
+
+        zug.verspaetung = 10
+        self.planung.verspaetungen_korrigieren()
+        self.assertEqual([(10, 10), (10, 7)], self.verspaetungen(2))
+        self.assertEqual([(7, 6), (6, 6)], self.verspaetungen(3))
 
     def test_kuppeln(self):
-        zug1 = self.zugliste[4]
-        zug2 = self.zugliste[5]
-        ziel1 = zug1.fahrplan[-1]
+        # ankunft zug 4: 11:10, mindestaufenthalt 1, ankunft zug 5: 11:14, abfahrt zug 5: 11:16
+        zug1 = self.planung.zugliste[4]
+        zug2 = self.planung.zugliste[5]
 
         zug1.verspaetung = 5
-        ziel1.verspaetung_an = 5
-        zug2.verspaetung = 0
-        ziel1.auto_korrektur.anwenden(zug1, ziel1)
-        self.assertEqual(zug2.verspaetung, 0)
-        self.assertEqual(zug2.fahrplan[0].verspaetung_an, 0)
-        self.assertEqual(zug2.fahrplan[0].verspaetung_ab, 0)
-
-        zug1.verspaetung = 10
-        ziel1.verspaetung_an = 10
         zug2.verspaetung = 0
-        ziel1.auto_korrektur.anwenden(zug1, ziel1)
-        self.assertEqual(zug2.verspaetung, 0)
-        self.assertEqual(zug2.fahrplan[1].verspaetung_an, 0)
-        self.assertEqual(zug2.fahrplan[1].verspaetung_ab, 4)
-        self.assertEqual(zug2.fahrplan[2].verspaetung_an, 4)
+        self.planung.verspaetungen_korrigieren()
+        self.assertEqual([(0, 0), (0, 0), (0, 0)], self.verspaetungen(5))
+        self.assertEqual(2, self.knoten_verspaetung_ab(4, 1))
 
+        # die kupplung wird vom korrekturobjekt berechnet und aendert die abfahrt von zug 4
         zug1.verspaetung = 0
-        ziel1.verspaetung_an = 0
         zug2.verspaetung = 8
-        ziel1.auto_korrektur.anwenden(zug1, ziel1)
-        self.assertEqual(zug2.verspaetung, 8)
-        self.assertEqual(zug2.fahrplan[0].verspaetung_an, 8)
-        self.assertEqual(zug2.fahrplan[0].verspaetung_ab, 8)
-        self.assertEqual(zug2.fahrplan[1].verspaetung_an, 8)
-        self.assertEqual(zug2.fahrplan[1].verspaetung_ab, 6)
-        self.assertEqual(zug2.fahrplan[2].verspaetung_an, 6)
+        self.planung.verspaetungen_korrigieren()
+        self.assertEqual([(8, 8), (8, 6), (6, 6)], self.verspaetungen(5))
+        self.assertEqual(8, self.knoten_verspaetung_ab(4, 1))
+        self.assertEqual(6, self.knoten_verspaetung_ab(5, 1))
+
+    def test_kuppeln_verspaeteter_kuppelzug(self):
+        # zug 4 kommt erst um 11:20 an, die kupplung ist um 11:20 abgeschlossen.
+        # die kupplung ueberschreibt die abfahrt des vektoriell berechneten kuppelziels von zug 4.
+        # die schritte von verspaetungen_korrigieren werden einzeln ausgefuehrt,
+        # damit das nachladen der vorgaenger in die arrays geprueft werden kann.
+        plg = self.planung
+        plg.zugliste[4].verspaetung = 10
+        plg.zugliste[5].verspaetung = 0
+        for node in plg.zielsortierung:
+            data = plg.zielgraph.nodes[node]
+            plg._zieldaten_initialisieren(data, data['obj'])
+        arrays = plg._materialize_plan_arrays()
+        plg._verspaetungen_propagieren(arrays)
+
+        row = arrays.index[planung.ZugZielNode.neu(plg.zugliste[4].fahrplan[1])]
+        self.assertEqual(planung.KORR_DURCHFAHRT, arrays.korr_kind[row])
+        self.assertEqual(6, arrays.v_ab[row])
+        self.assertEqual(6, self.knoten_verspaetung_ab(4, 1))
+        self.assertEqual(4, self.knoten_verspaetung_ab(5, 1))
+        self.assertEqual([(0, 0), (0, 4), (4, 4)], self.verspaetungen(5))
 
     def test_fluegeln(self):
         # ankunft zug 6: 12:14, abfahrt zug 6: 12:16, abfahrt zug 7: 12:18
-        zug1 = self.zugliste[6]
-        zug2 = self.zugliste[7]
-        ziel1 = zug1.fahrplan[1]
-        ziel2 = zug2.fahrplan[0]
+        zug = self.planung.zugliste[6]
 
-        zug1.verspaetung = 10
-        ziel1.verspaetung_an = 10
-        zug2.verspaetung = 10
-        ziel1.auto_korrektur.anwenden(zug1, ziel1)
-        self.assertEqual(ziel1.verspaetung_ab, 8)
-        self.assertEqual(ziel2.verspaetung_an, 10)
-        self.assertEqual(ziel2.verspaetung_ab, 8)
-        self.assertEqual(zug2.verspaetung, 10)
-
-        zug1.verspaetung = 1
-        ziel1.verspaetung_an = 1
-        zug2.verspaetung = 1
-        ziel1.auto_korrektur.anwenden(zug1, ziel1)
-        self.assertEqual(ziel1.verspaetung_ab, 0)
-        self.assertEqual(ziel2.verspaetung_an, 1)
-        self.assertEqual(ziel2.verspaetung_ab, 0)
-        self.assertEqual(zug2.verspaetung, 1)
+        zug.verspaetung = 10
+        self.planung.verspaetungen_korrigieren()
+        self.assertEqual([(10, 10), (10, 10), (10, 10)], self.verspaetungen(6))
+        self.assertEqual([(10, 8), (8, 8)], self.verspaetungen(7))
+
+        zug.verspaetung = 1
+        self.planung.verspaetungen_korrigieren()
+        self.assertEqual([(1, 1), (1, 1), (1, 1)], self.verspaetungen(6))
+        self.assertEqual([(1, 0), (0, 0)], self.verspaetungen(7))
 
     def test_fluegeln_hamm(self):
-        zug1 = self.zugliste[8]
-        zug2 = self.zugliste[9]
-        ziel1 = zug1.fahrplan[1]
-        ziel2 = zug2.fahrplan[0]
+        # ankunft zug 8: 14:48, abfahrt zug 8: 14:52, abfahrt zug 9: 14:54
+        zug = self.planung.zugliste[8]
 
-        zug1.verspaetung = 20
-        zug2.verspaetung = 20
-        ziel1.verspaetung_an = 20
-        ziel1.auto_korrektur.anwenden(zug1, ziel1)
-        self.assertEqual(ziel1.verspaetung_ab, 16)
-        self.assertEqual(ziel2.verspaetung_an, 20)
-        self.assertEqual(ziel2.verspaetung_ab, 16)
-        self.assertEqual(zug2.verspaetung, 20)
+        zug.verspaetung = 20
+        self.planung.verspaetungen_korrigieren()
+        self.assertEqual([(20, 20), (20, 20), (20, 20)], self.verspaetungen(8))
+        self.assertEqual([(20, 18), (18, 18)], self.verspaetungen(9))
 
 
 class TestPlanung(unittest.TestCase):
     def test_zugverspaetung_korrigieren(self):
-        self.planung = planung.Planung()
-        # bemerkung: die zugliste von self.planung wird nicht benoetigt!
-        self.zugliste = beispiel_zugliste(self.planung)
-        zug = self.zugliste[3]
-        zug.ziel_index = 0
-        zug.verspaetung = 3
-        self.planung.zugverspaetung_korrigieren(zug)
+        plg = planung.Planung()
+        plg.zuege_uebernehmen(beispiel_zugliste())
+        plg.verspaetungen_korrigieren()
+
+        # nur der zugstamm von zug 2 wird nachgefuehrt, zug 1 bleibt unveraendert
+        plg.zugliste[1].verspaetung = 5
+        plg.zugliste[2].verspaetung = 10
+        plg.zugverspaetung_korrigieren(plg.zugliste[2])
 
-        self.assertEqual(zug.fahrplan[0].verspaetung_an, 3)
-        self.assertEqual(zug.fahrplan[0].verspaetung_ab, 3)
-        self.assertEqual(zug.fahrplan[1].verspaetung_an, 3)
-        self.assertEqual(zug.fahrplan[1].verspaetung_ab, 3)
+        self.assertEqual(7, plg.zugliste[2].fahrplan[1].verspaetung_ab)
+        self.assertEqual(7, plg.zugliste[3].fahrplan[0].verspaetung_an)
+        self.assertEqual(6, plg.zugliste[3].fahrplan[0].verspaetung_ab)
+        self.assertEqual(6, plg.zugliste[3].fahrplan[1].verspaetung_an)
+        self.assertEqual(0, plg.zugliste[1].fahrplan[1].verspaetung_an)
 
-        self.zugliste = beispiel_zugliste(self.planung)
-        zug = self.zugliste[3]
-        zug.ziel_index = 1
-        zug.verspaetung = 5
-        zug.sichtbar = True
-        self.planung.zugverspaetung_korrigieren(zug)
+        # der folgezug fuehrt den ganzen stamm nach
+        plg.zugliste[2].verspaetung = 5
+        plg.zugverspaetung_korrigieren(plg.zugliste[3])
 
-        self.assertEqual(zug.fahrplan[0].verspaetung_an, 0)
-        self.assertEqual(zug.fahrplan[0].verspaetung_ab, 5)
-        self.assertEqual(zug.fahrplan[1].verspaetung_an, 5)
-        self.assertEqual(zug.fahrplan[1].verspaetung_ab, 5)
+        self.assertEqual(2, plg.zugliste[2].fahrplan[1].verspaetung_ab)
+        self.assertEqual(2, plg.zugliste[3].fahrplan[0].verspaetung_an)
+        self.assertEqual(1, plg.zugliste[3].fahrplan[0].verspaetung_ab)
+        self.assertEqual(0, plg.zugliste[1].fahrplan[1].verspaetung_an)
 
     def test_verspaetungen_korrigieren_1(self):
         plg = planung.Planung()
@@ -462,7 +279,7 @@ class TestPlanung(unittest.TestCase):
         zug2 = ZugDetails()
         zug2.zid = 2
         zug2.name = "Zug 2"
-        zug2.von = "B"
+        zug2.von = "Gleis 1"
         zug2.nach = "C"
         zug2.gleis = zug2.plangleis = "1"
         zug2.verspaetung = 3
@@ -473,14 +290,12 @@ class TestPlanung(unittest.TestCase):
         fpz1.an = datetime.time(hour=9, minute=10)
         fpz1.flags = f"E({zug2.zid})"
         fpz1.ersatzzug = zug2
-        fpz1.auto_korrektur = planung.Ersatzzug(plg)
         zug1.fahrplan.append(fpz1)
 
         fpz2 = FahrplanZeile(zug2)
         fpz2.gleis = fpz2.plan = "1"
         fpz2.an = datetime.time(hour=9, minute=15)
         fpz2.ab = datetime.time(hour=9, minute=15)
-        fpz2.auto_korrektur = planung.PlanmaessigeAbfahrt(plg)
         zug2.fahrplan.append(fpz2)
 
         zugliste = [zug1, zug2]
@@ -491,10 +306,10 @@ class TestPlanung(unittest.TestCase):
         self.assertEqual(plg.zugliste[zug1.zid].fahrplan[1].verspaetung_ab, 0)
         self.assertEqual(plg.zugliste[zug1.zid].fahrplan[1].an, datetime.time(hour=9, minute=10))
         self.assertEqual(plg.zugliste[zug1.zid].fahrplan[1].ab, datetime.time(hour=9, minute=15))
-        self.assertEqual(plg.zugliste[zug2.zid].verspaetung, 0)
-        self.assertEqual(plg.zugliste[zug2.zid].fahrplan[1].verspaetung_ab, 0)
-        self.assertEqual(plg.zugliste[zug2.zid].fahrplan[1].an, datetime.time(hour=9, minute=15))
-        self.assertEqual(plg.zugliste[zug2.zid].fahrplan[1].ab, datetime.time(hour=9, minute=15))
+        self.assertEqual(plg.zugliste[zug2.zid].fahrplan[0].verspaetung_an, 0)
+        self.assertEqual(plg.zugliste[zug2.zid].fahrplan[0].verspaetung_ab, 0)
+        self.assertEqual(plg.zugliste[zug2.zid].fahrplan[0].an, datetime.time(hour=9, minute=15))
+        self.assertEqual(plg.zugliste[zug2.zid].fahrplan[0].ab, datetime.time(hour=9, minute=15))
 
     def test_verspaetungen_korrigieren_2(self):
         zug1 = ZugDetails()
@@ -508,7 +323,7 @@ class TestPlanung(unittest.TestCase):
         zug2 = ZugDetails()
         zug2.zid = 2
         zug2.name = "Zug 2"
-        zug2.von = "B"
+        zug2.von = "Gleis 1"
         zug2.nach = "C"
         zug2.gleis = "1"
         zug2.verspaetung = 10
@@ -527,6 +342,7 @@ class TestPlanung(unittest.TestCase):
 
         zugliste = [zug1, zug2]
         plg = planung.Planung()
+        plg.params.mindestaufenthalt_ersatz = 0
         plg.zuege_uebernehmen(zugliste)
         plg.verspaetungen_korrigieren()
 
@@ -534,7 +350,84 @@ class TestPlanung(unittest.TestCase):
         self.assertEqual(5, plg.zugliste[zug1.zid].fahrplan[1].verspaetung_ab)
         self.assertEqual(datetime.time(hour=9, minute=10), plg.zugliste[zug1.zid].fahrplan[1].an)
         self.assertEqual(datetime.time(hour=9, minute=15), plg.zugliste[zug1.zid].fahrplan[1].ab)
-        self.assertEqual(5, plg.zugliste[zug2.zid].verspaetung)
-        self.assertEqual(5, plg.zugliste[zug2.zid].fahrplan[1].verspaetung_ab)
-        self.assertEqual(datetime.time(hour=9, minute=15), plg.zugliste[zug2.zid].fahrplan[1].an)
-        self.assertEqual(datetime.time(hour=9, minute=15), plg.zugliste[zug2.zid].fahrplan[1].ab)
+        self.assertEqual(5, plg.zugliste[zug2.zid].fahrplan[0].verspaetung_an)
+        self.assertEqual(5, plg.zugliste[zug2.zid].fahrplan[0].verspaetung_ab)
+        self.assertEqual(datetime.time(hour=9, minute=15), plg.zugliste[zug2.zid].fahrplan[0].an)
+        self.assertEqual(datetime.time(hour=9, minute=15), plg.zugliste[zug2.zid].fahrplan[0].ab)
+
+
+class TestZugDetailsPlanung(unittest.TestCase):
+    def setUp(self):
+        self.zug = ZugDetails()
+        self.zug.zid = 1
+        self.zug.name = "Zug 1"
+        self.zug.von = "A"
+        self.zug.nach = "B"
+        self.zug.gleis = self.zug.plangleis = "2"
+        self.zug.sichtbar = False
+
+        for gleis, an, ab in [("1", 10, 11), ("2", 15, 16), ("3", 20, 21)]:
+            fpz = FahrplanZeile(self.zug)
+            fpz.gleis = fpz.plan = gleis
+            fpz.an = datetime.time(hour=9, minute=an)
+            fpz.ab = datetime.time(hour=9, minute=ab)
+            self.zug.fahrplan.append(fpz)
+
+    def test_find_fahrplan_zielnr(self):
+        zug = planung.ZugDetailsPlanung()
+        zug.assign_zug_details(self.zug)
+
+        self.assertEqual(["A", "1", "2", "3", "B"], list(zug.route(plan=True)))
+        for n, ziel in enumerate(zug.fahrplan):
+            self.assertIs(ziel, zug.find_fahrplan_zielnr(n * 1000))
+        self.assertRaises(ValueError, zug.find_fahrplan_zielnr, 500)
+
+    def test_find_fahrplanzeile(self):
+        zug = planung.ZugDetailsPlanung()
+        zug.assign_zug_details(self.zug)
+
+        self.assertIs(zug.fahrplan[2], zug.find_fahrplanzeile(plan="2"))
+        self.assertEqual(2, zug.find_fahrplan_index(plan="2"))
+        self.assertEqual(4, zug.find_fahrplan_index(plan="B"))
+        self.assertIsNone(zug.find_fahrplanzeile(plan="X"))
+        self.assertIsNone(zug.find_fahrplan_index(plan="X"))
+        self.assertEqual(3, zug.find_fahrplan_index(gleis="3"))
+
+    def test_update_zug_details(self):
+        zug = planung.ZugDetailsPlanung()
+        zug.assign_zug_details(self.zug)
+
+        self.zug.fahrplan[1].gleis = "2a"
+        zug.update_zug_details(self.zug)
+
+        self.assertEqual("2a", zug.fahrplan[2].gleis)
+        self.assertEqual("2", zug.fahrplan[2].plan)
+        self.assertEqual(2, zug.ziel_index)
+
+
+class TestCsrSortierung(unittest.TestCase):
+    def test_generationen(self):
+        # 0 -> 1 -> 3, 0 -> 2 -> 3, 4 isoliert
+        indptr = np.array([0, 2, 3, 4, 4, 4])
+        indices = np.array([1, 2, 3, 3])
+        sortierung, grenzen = planung.csr_topologisch_sortieren(indptr, indices)
+        self.assertEqual([0, 4, 1, 2, 3], sortierung.tolist())
+        self.assertEqual([0, 2, 4, 5], grenzen)
+
+    def test_zyklus(self):
+        # 0 -> 1 -> 2 -> 1
+        indptr = np.array([0, 1, 2, 3])
+        indices = np.array([1, 2, 1])
+        self.assertRaises(nx.NetworkXUnfeasible, planung.csr_topologisch_sortieren, indptr, indices)
+
+    def test_zielsortierung(self):
+        pl = planung.Planung()
+        a = planung.ZugZielNode(1, 1000, "A")
+        b = planung.ZugZielNode(1, 2000, "B")
+        c = planung.ZugZielNode(2, 1000, "A")
+        pl.zielgraph.add_edge(a, b)
+        pl.zielgraph.add_edge(c, b)
+        pl._zielgraph_sortieren()
+        self.assertEqual(b, pl.zielsortierung[-1])
+        self.assertEqual([0, 2, 3], pl._zielgenerationen)
+        self.assertEqual({node: row for row, node in enumerate(pl.zielsortierung)}, pl._zielzeilen)
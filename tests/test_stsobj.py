@@ -35,3 +35,11 @@ class TestStsObj(unittest.TestCase):
         assert t.hour == r.hour
         assert t.minute == r.minute
         assert t.second == r.second
+
+    def test_flag_zid(self):
+        assert stsobj.flag_zid("DE(1234)", 'E') == 1234
+        assert stsobj.flag_zid("K2(77)F(88)", 'K') == 77
+        assert stsobj.flag_zid("K2(77)F(88)", 'F') == 88
+        assert stsobj.flag_zid("D", 'E') is None
+        assert stsobj.flag_lokwechsel("W[12][34]") == (12, 34)
+        assert stsobj.flag_lokwechsel("R") is None